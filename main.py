@@ -1,26 +1,87 @@
-print("🔥 PYTHON APP STARTING!")
-print("🔥 ALL IMPORTS SUCCESSFUL!")
-
 import discord
 import aiohttp
 import asyncio
 import os
-from discord.ext import commands
+from discord.ext import commands, tasks
 from aiohttp import web
-import threading
 import time
-import json
-from collections import defaultdict
+import orjson
+from collections import defaultdict, deque, namedtuple
+from functools import lru_cache
+from itertools import islice
+from cachetools import LRUCache, TTLCache
 import re
+import mimetypes
+import heapq
+import signal
+import random
+import logging
+import logging.handlers
+import queue
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+try:
+    import uvloop  # Optional faster event loop on Linux/macOS
+except ImportError:
+    uvloop = None
+
+# Logging - set LOG_LEVEL=DEBUG to trace every message
+log = logging.getLogger("bridge")
+
+def setup_logging():
+    """Route log records through a queue so the event loop never blocks on stdout; returns the started listener"""
+    log_queue = queue.SimpleQueue()
+    log_output = logging.StreamHandler()
+    log_output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    log_input = logging.handlers.QueueHandler(log_queue)
+    log_input.setFormatter(logging.Formatter("%(message)s"))  # only merge args here; the listener applies the real format
+    level_name = os.getenv("LOG_LEVEL", "INFO").upper()
+    level = logging.getLevelName(level_name)
+    logging.basicConfig(level=level if isinstance(level, int) else logging.INFO, handlers=[log_input])
+    listener = logging.handlers.QueueListener(log_queue, log_output)
+    listener.start()
+    if not isinstance(level, int):
+        log.warning("⚠️ Unknown LOG_LEVEL %r, using INFO", level_name)
+    return listener
 
 # Configuration from environment variables
-DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
-GROUPME_BOT_ID = os.getenv("GROUPME_BOT_ID")
-GROUPME_ACCESS_TOKEN = os.getenv("GROUPME_ACCESS_TOKEN")
-DISCORD_CHANNEL_ID = int(os.getenv("DISCORD_CHANNEL_ID", "0"))
-GROUPME_GROUP_ID = os.getenv("GROUPME_GROUP_ID")
-PORT = int(os.getenv("PORT", "8080"))  # Cloud Run default
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Bridge settings, read from the environment once at startup"""
+    discord_bot_token: str | None
+    groupme_bot_id: str | None
+    groupme_access_token: str | None
+    discord_channel_id: int
+    groupme_group_id: str | None
+    port: int
+
+    def missing_required(self):
+        """Return the names of required settings that aren't set"""
+        required = (
+            ("DISCORD_BOT_TOKEN", self.discord_bot_token),
+            ("GROUPME_BOT_ID", self.groupme_bot_id),
+            ("DISCORD_CHANNEL_ID", self.discord_channel_id),
+        )
+        return [name for name, value in required if not value]
+
+def load_config():
+    """Build the Config from environment variables"""
+    return Config(
+        discord_bot_token=os.getenv("DISCORD_BOT_TOKEN"),
+        groupme_bot_id=os.getenv("GROUPME_BOT_ID"),
+        groupme_access_token=os.getenv("GROUPME_ACCESS_TOKEN"),
+        discord_channel_id=int(os.getenv("DISCORD_CHANNEL_ID", "0")),
+        groupme_group_id=os.getenv("GROUPME_GROUP_ID"),
+        port=int(os.getenv("PORT", "8080")),  # Cloud Run default
+    )
+
+CONFIG = load_config()
+DISCORD_BOT_TOKEN = CONFIG.discord_bot_token
+GROUPME_BOT_ID = CONFIG.groupme_bot_id
+GROUPME_ACCESS_TOKEN = CONFIG.groupme_access_token
+DISCORD_CHANNEL_ID = CONFIG.discord_channel_id
+GROUPME_GROUP_ID = CONFIG.groupme_group_id
+PORT = CONFIG.port
 
 # GroupMe API endpoints
 GROUPME_POST_URL = "https://api.groupme.com/v3/bots/post"
@@ -30,6 +91,8 @@ GROUPME_MESSAGES_URL = f"https://api.groupme.com/v3/groups/{GROUPME_GROUP_ID}/me
 GROUPME_POLLS_CREATE_URL = f"https://api.groupme.com/v3/poll/{GROUPME_GROUP_ID}"
 GROUPME_POLLS_SHOW_URL = "https://api.groupme.com/v3/poll"  # + /{poll_id}
 GROUPME_POLLS_LIST_URL = f"https://api.groupme.com/v3/groups/{GROUPME_GROUP_ID}/polls"
+# Sent per request rather than as a session default, since the shared session also downloads from Discord's CDN
+GROUPME_AUTH_HEADERS = {'X-Access-Token': GROUPME_ACCESS_TOKEN} if GROUPME_ACCESS_TOKEN else {}
 
 # Discord bot setup with enhanced intents
 intents = discord.Intents.default()
@@ -37,117 +100,319 @@ intents.message_content = True  # Required for reading message content
 intents.reactions = True
 intents.guilds = True  # Required for guild operations
 intents.members = True  # Might be needed for some operations
+intents.typing = False  # We never handle typing events; don't have the gateway send them
+intents.presences = False
 bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
 
 # Global variables
-bot_status = {"ready": False, "start_time": time.time()}
-message_mapping = {}  # Maps Discord message IDs to GroupMe message IDs
-groupme_to_discord = {}  # Maps GroupMe message IDs to Discord message IDs
-recent_messages = defaultdict(list)  # Stores recent messages for threading context
+bot_status = {"ready": False, "start_time": time.monotonic()}
+# Cross-platform message ID mappings are LRU-bounded so a long-running bot doesn't grow
+# without limit; 10k entries covers reactions on any reasonably recent message.
+MESSAGE_MAPPING_CAPACITY = 10000
+message_mapping = LRUCache(maxsize=MESSAGE_MAPPING_CAPACITY)  # Maps Discord message IDs to GroupMe message IDs
+groupme_to_discord = LRUCache(maxsize=MESSAGE_MAPPING_CAPACITY)  # Maps GroupMe message IDs to Discord message IDs
+recent_messages = defaultdict(lambda: deque(maxlen=20))  # Last 20 messages per channel for threading context
+RECENT_MESSAGE_TTL = 600  # Seconds before a recent message is dropped by expire_recent_messages
+groupme_message_cache = TTLCache(maxsize=2048, ttl=600)  # GroupMe message ID -> message, for reaction context
+bridged_channel = None  # The monitored Discord channel, resolved in on_ready
+recent_page_fetch = None  # In-flight fetch of the latest GroupMe page, shared by concurrent lookups
+older_page_fetches = {}  # before_id -> in-flight fetch of the page behind it, shared the same way
+groupme_poll_cache = TTLCache(maxsize=256, ttl=10)  # GroupMe poll ID -> poll data, for !pollinfo lookups
+poll_fetches = {}  # GroupMe poll ID -> in-flight fetch, shared by concurrent lookups
+http_session = None  # Shared aiohttp session, reused for all GroupMe/Discord CDN requests
+health_runner = None  # aiohttp runner for the health check/webhook server
+# Discord messages are handed to GroupMe through a bounded queue so gateway handlers don't wait
+# on GroupMe's response. One worker keeps messages in order; more trade ordering for throughput.
+OUTBOUND_WORKERS = max(1, int(os.getenv("OUTBOUND_WORKERS", "1")))
+outbound_queue = asyncio.Queue(maxsize=1000)
+outbound_workers = []
+# GroupMe webhooks are acked as soon as they're queued; workers do the Discord/GroupMe calls.
+# One worker keeps GroupMe messages in order on Discord; more trade ordering for throughput.
+WEBHOOK_WORKERS = max(1, int(os.getenv("WEBHOOK_WORKERS", "1")))
+webhook_queue = asyncio.Queue(maxsize=1024)  # (received_at, payload)
+webhook_stats = {"processed": 0, "dropped": 0, "last_latency_ms": 0.0}
+# Reaction and vote notices arriving within one frame are posted together, one message per platform
+NOTICE_FRAME_SECONDS = 0.5
+notice_queue = asyncio.Queue(maxsize=1000)  # (target, text) with target 'groupme' or 'discord'
+notice_task = None  # The notice_flusher task, stopped separately so shutdown can drain the queue first
+shutdown_task = None  # bot.close() scheduled by the SIGTERM handler
+background_tasks = set()  # Strong references so long-running tasks aren't garbage collected mid-flight
 
 # NEW: Poll mapping and tracking
 poll_mapping = {}  # Maps Discord poll IDs to GroupMe poll IDs
 groupme_poll_mapping = {}  # Maps GroupMe poll IDs to Discord poll IDs
-active_polls = {}  # Stores active poll data for vote synchronization
-poll_vote_tracking = defaultdict(dict)  # Tracks who voted for what to prevent loops
-
-# Emoji mapping for reactions
-EMOJI_MAPPING = {
-    '❤️': '❤️', '👍': '👍', '👎': '👎', '😂': '😂', '😮': '😮', '😢': '😢', '😡': '😡',
-    '✅': '✅', '❌': '❌', '🔥': '🔥', '💯': '💯', '🎉': '🎉', '👏': '👏', '💪': '💪',
-    '🤔': '🤔', '😍': '😍', '🙄': '🙄', '😴': '😴', '🤷': '🤷', '🤦': '🤦', '💀': '💀',
-    '🪩': '🪩'
-}
-
-def run_health_server():
-    """Run health check server in a separate thread - Cloud Run compatible"""
-    async def health_check(request):
-        return web.json_response({
-            "status": "healthy",
-            "bot_ready": bot_status["ready"],
-            "uptime": time.time() - bot_status["start_time"],
-            "platform": "Google Cloud Run",
-            "features": {
-                "image_support": bool(GROUPME_ACCESS_TOKEN),
-                "reactions": bool(GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID),
-                "threading": True,
-                "polls": bool(GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID)
-            },
-            "active_polls": len(active_polls)
-        })
-
-    async def groupme_webhook(request):
-        """Handle GroupMe webhook events including polls"""
-        try:
-            data = await request.json()
-            print(f"📨 GroupMe webhook received: {data}")
-            
-            # Handle poll events from GroupMe
-            if data.get('group_id') == GROUPME_GROUP_ID:
-                await handle_groupme_webhook_event(data)
-                
-            return web.json_response({"status": "success"})
-        except Exception as e:
-            print(f"❌ Error handling GroupMe webhook: {e}")
-            return web.json_response({"error": str(e)}, status=500)
+active_polls = {}  # Poll ID -> TrackedPoll for vote synchronization; created_at/expires_at are time.monotonic(), not epoch
+MAX_ACTIVE_POLLS = 1000  # Oldest polls are forgotten early past this many, on top of POLL_TTL
+poll_vote_tracking = {}  # (poll_id, user_name) -> (option, expires_at); tracks who voted to prevent loops
+poll_voters = defaultdict(set)  # poll_id -> user names in poll_vote_tracking, so forgetting a poll skips a full scan
+# Min-heaps of (expiry, key) so the cleanup sweep only touches entries that are actually due
+POLL_TTL = 86400  # Polls and their vote tracking are dropped after 24 hours
+poll_expiry_heap = []
+vote_expiry_heap = []
+# discord.py's Poll shape is fixed per release, so probe it once instead of on every poll
+POLL_HAS_ANSWERS = hasattr(getattr(discord, 'Poll', None), 'answers')
 
-    async def start_server():
-        app = web.Application()
-        
-        # Cloud Run requires health checks on root
-        app.router.add_get('/', health_check)
-        app.router.add_get('/health', health_check)
-        app.router.add_get('/_ah/health', health_check)  # Google App Engine style
-        app.router.add_post('/groupme/webhook', groupme_webhook)
-        
-        # Add CORS for Cloud Run
-        app.router.add_options('/{path:.*}', lambda request: web.Response())
-        
-        runner = web.AppRunner(app)
-        await runner.setup()
-        
-        # Cloud Run binds to 0.0.0.0 and uses PORT env var
-        site = web.TCPSite(runner, '0.0.0.0', PORT)
-        await site.start()
-        print(f"🌐 Health check server running on 0.0.0.0:{PORT} (Google Cloud Run)")
-        print(f"🔗 GroupMe webhook endpoint: https://your-service.a.run.app/groupme/webhook")
-        
-        # Keep server running
+# Reactions we bridge, in display order
+SUPPORTED_EMOJIS = (
+    '❤️', '👍', '👎', '😂', '😮', '😢', '😡',
+    '✅', '❌', '🔥', '💯', '🎉', '👏', '💪',
+    '🤔', '😍', '🙄', '😴', '🤷', '🤦', '💀',
+    '🪩'
+)
+EMOJI_SET = frozenset(SUPPORTED_EMOJIS)  # Fast membership checks for supported reactions
+EMOJI_LIST_STR = ', '.join(SUPPORTED_EMOJIS)  # Prebuilt list for status/help messages
+REACTION_TEMPLATE = "{} reacted {} to {}"  # user, emoji, context
+# Permissions the poll support check reports, as (label, Permissions bit)
+CHECKED_PERMISSIONS = tuple((label, getattr(discord.Permissions, name).flag) for label, name in (
+    ("Send Messages", 'send_messages'),
+    ("Add Reactions", 'add_reactions'),
+    ("Use External Emojis", 'use_external_emojis'),
+    ("Embed Links", 'embed_links'),
+    ("Manage Messages", 'manage_messages')
+))
+EMBED_DESCRIPTION_LIMIT = 4096  # Discord rejects embeds with longer descriptions
+# Static parts of the poll listing/info embeds, so commands only fill in the values
+TRACKED_POLL_LINE = "{} **{}...** (by {}, {} ago){}"  # source, question, author, age, GroupMe ID suffix
+GROUPME_POLL_LINE = "📊 **{}...** (ID: {}, Status: {})"  # subject, poll ID, status
+POLL_DETAILS_TEMPLATE = ("**Status:** {status}\n**Type:** {type}\n**Visibility:** {visibility}\n"
+                         "**Total Votes:** {total_votes}\n**Created:** {created}\n**Expires:** {expires}")
+POLL_COMMANDS_HINT = "`!listpolls` - All GroupMe polls\n`!nativepoll` - Create native poll\n`!pollinfo <id>` - Poll details"
+POLL_KEYWORDS = ('poll:', '📊', 'vote:', 'survey:')  # Substrings that mark a message as a possible text poll
+OPTION_EMOJIS = ("1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟")  # Numbered poll option markers
+
+# Streamed image transfers can legitimately outlast the session's default 15s timeout
+IMAGE_TRANSFER_TIMEOUT = aiohttp.ClientTimeout(total=120, connect=5)
+MAX_IMAGE_BYTES = 20 * 1024 * 1024  # Refuse attachments larger than this before streaming them
+
+# GroupMe responses worth retrying; anything else is final. Bot posts aren't idempotent and a 5xx
+# can come back after GroupMe already accepted the message, so only rate limiting is retried.
+RETRY_STATUSES = frozenset({429})
+# Caps in-flight GroupMe API (api.groupme.com) calls so bursts queue locally instead of tripping rate limits;
+# image uploads go to a separate host and can run for minutes, so they don't take a slot
+GROUPME_MAX_CONCURRENCY = max(1, int(os.getenv("GROUPME_MAX_CONCURRENCY", "4")))
+groupme_slots = asyncio.Semaphore(GROUPME_MAX_CONCURRENCY)
+
+# Reply detection patterns, compiled once instead of on every message
+REPLY_PATTERNS = tuple(re.compile(pattern, re.DOTALL) for pattern in (
+    r'^Reply to @(\w+):\s*(.+)',
+    r'^@(\w+)\s+(.+)',
+    r'^>\s*(.+?)\n(.+)',
+    r'^"(.+?)"\s*(.+)'
+))
+
+# Text poll patterns: a "Poll:"/📊 header with the question, then newline- or comma-separated options
+POLL_PATTERNS = tuple(re.compile(pattern, re.DOTALL | re.IGNORECASE) for pattern in (
+    r'^(?:📊\s*)?(?:poll|vote|survey):\s*(.+?)\n(.+)',
+    r'^📊\s*(.+?)\n(.+)',
+    r'^(?:📊\s*)?(?:poll|vote|survey):\s*(.+?\?)\s*(.+)'
+))
+# One case-insensitive scan for any poll keyword, without lowercasing a copy of the message
+POLL_KEYWORD_PATTERN = re.compile('|'.join(map(re.escape, POLL_KEYWORDS)), re.IGNORECASE)
+# GroupMe messages only become Discord polls on "poll:" or 📊, not the wider Discord-side keywords
+GROUPME_POLL_TRIGGER = re.compile(r'poll:|📊', re.IGNORECASE)
+OPTION_PATTERN = re.compile(r'^\s*(?:\d+[.)]|[-*•]|\d\ufe0f\u20e3|🔟)?\s*(.*?)\s*$')
+# Inline option markers ("1️⃣ Pizza 2️⃣ Tacos", "A) Pizza B) Tacos"), split in one linear pass;
+# a letter marker has to stand alone so "Plan A) now" isn't cut inside the word
+OPTION_SPLITS = tuple(re.compile(pattern) for pattern in (
+    r'(?:\d\ufe0f?\u20e3|🔟)\s*',
+    r'(?<![^\s,;])[A-J]\)\s*'
+))
+
+def get_discord_channel():
+    """Return the monitored Discord channel, resolving it here if on_ready hasn't yet"""
+    global bridged_channel
+    if bridged_channel is None:
+        bridged_channel = bot.get_channel(DISCORD_CHANNEL_ID)
+    return bridged_channel
+
+def get_http_session():
+    """Return the shared aiohttp session, creating it on first use so connections are pooled"""
+    global http_session
+    if http_session is None or http_session.closed:
+        # GroupMe traffic only hits api.groupme.com and image.groupme.com, so a small per-host
+        # limit with a long keep-alive maximizes connection reuse; DNS is cached between reconnects
+        connector = aiohttp.TCPConnector(
+            limit=32,
+            limit_per_host=16,
+            keepalive_timeout=75,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
+        )
+        http_session = aiohttp.ClientSession(
+            connector=connector,
+            json_serialize=json_dumps,
+            timeout=aiohttp.ClientTimeout(total=15, connect=5),
+            raise_for_status=False
+        )
+    return http_session
+
+def json_dumps(obj):
+    """Encode an object to a JSON string with orjson"""
+    return orjson.dumps(obj).decode()
+
+async def read_json(response):
+    """Decode a JSON response body with orjson (faster and lighter on GC than stdlib json)"""
+    return orjson.loads(await response.read())
+
+async def close_http_session():
+    """Close the shared aiohttp session on shutdown"""
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+
+def groupme_bot_payload(text):
+    """Build the GroupMe bot API body for a plain text message"""
+    return {"bot_id": GROUPME_BOT_ID, "text": text}
+
+async def post_to_groupme(payload, max_attempts=4):
+    """POST a bot message to GroupMe, retrying transient failures with jittered backoff; returns the final status"""
+    session = get_http_session()
+    for attempt in range(max_attempts):
         try:
-            while True:
-                await asyncio.sleep(3600)  # Check every hour
-        except asyncio.CancelledError:
-            print("🛑 Health server shutting down...")
-            await runner.cleanup()
-
-    # Create new event loop for this thread
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+            async with groupme_slots, session.post(GROUPME_POST_URL, json=payload) as response:
+                status = response.status
+                retry_after = response.headers.get('Retry-After', '')
+        except aiohttp.ClientConnectorError:
+            # Nothing reached GroupMe, so retrying can't duplicate the message
+            if attempt == max_attempts - 1:
+                raise
+            status, retry_after = None, ''
+        
+        if attempt == max_attempts - 1 or (status is not None and status not in RETRY_STATUSES):
+            if status is not None and status >= 500:
+                log.warning("⚠️ GroupMe POST returned %s; not retrying since the message may already be posted", status)
+            return status
+        
+        # Full jitter keeps concurrent senders from retrying in lockstep
+        delay = random.uniform(0, min(30, 0.5 * 2 ** attempt))
+        if retry_after.isdigit():
+            delay = max(delay, min(30, int(retry_after)))
+        log.warning("⚠️ GroupMe POST failed (status %s), retrying in %.1fs", status, delay)
+        await asyncio.sleep(delay)
+
+async def post_groupme_poll(poll_payload):
+    """Create a native GroupMe poll; returns the status and raw response body"""
+    # Poll creation isn't idempotent, so it shares the concurrency limit but is never retried
+    async with groupme_slots:
+        async with get_http_session().post(GROUPME_POLLS_CREATE_URL, json=poll_payload, headers=GROUPME_AUTH_HEADERS) as response:
+            return response.status, await response.text()
+
+async def health_check(request):
+    """Health check endpoint - Cloud Run compatible"""
+    return web.json_response({
+        "status": "healthy",
+        "bot_ready": bot_status["ready"],
+        "uptime": time.monotonic() - bot_status["start_time"],
+        "platform": "Google Cloud Run",
+        "features": {
+            "image_support": bool(GROUPME_ACCESS_TOKEN),
+            "reactions": bool(GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID),
+            "threading": True,
+            "polls": bool(GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID)
+        },
+        "active_polls": len(active_polls),
+        "tracked_votes": len(poll_vote_tracking),
+        "webhook_queue": {"depth": webhook_queue.qsize(), **webhook_stats}
+    }, dumps=json_dumps)
+
+async def groupme_webhook(request):
+    """Handle GroupMe webhook events including polls"""
     try:
-        loop.run_until_complete(start_server())
+        data = orjson.loads(await request.read())
+        # Keep the info line small; the full payload is only rendered at debug level
+        log.info("📨 GroupMe webhook received: id=%s sender=%s", data.get('id'), data.get('name'))
+        log.debug("📨 GroupMe webhook payload: %s", data)
+        
+        # Queue events for our group and ack right away so slow downstream calls don't hold GroupMe open
+        if data.get('group_id') == GROUPME_GROUP_ID:
+            try:
+                webhook_queue.put_nowait((time.monotonic(), data))
+            except asyncio.QueueFull:
+                webhook_stats["dropped"] += 1
+                log.warning("⚠️ Webhook queue full, rejecting GroupMe event %s", data.get('id'))
+                return web.json_response({"status": "busy"}, status=503, dumps=json_dumps)
+            
+        return web.json_response({"status": "queued"}, dumps=json_dumps)
     except Exception as e:
-        print(f"❌ Health server error: {e}")
-    finally:
-        loop.close()
+        log.exception("❌ Error handling GroupMe webhook")
+        return web.json_response({"error": str(e)}, status=500, dumps=json_dumps)
+
+async def webhook_worker():
+    """Process queued GroupMe webhook events"""
+    while True:
+        received_at, data = await webhook_queue.get()
+        try:
+            await handle_groupme_webhook_event(data)
+        except Exception:
+            log.exception("❌ Error processing queued GroupMe webhook")
+        finally:
+            webhook_stats["processed"] += 1
+            webhook_stats["last_latency_ms"] = round((time.monotonic() - received_at) * 1000, 1)
+            webhook_queue.task_done()
+
+async def start_health_server():
+    """Start the health check/webhook server on the bot's own event loop"""
+    global health_runner
+    log.info("🏥 Starting enhanced health check server with webhook support...")
+    app = web.Application()
+    
+    # Cloud Run requires health checks on root
+    app.router.add_get('/', health_check)
+    app.router.add_get('/health', health_check)
+    app.router.add_get('/_ah/health', health_check)  # Google App Engine style
+    app.router.add_post('/groupme/webhook', groupme_webhook)
+    
+    # Add CORS for Cloud Run
+    app.router.add_options('/{path:.*}', lambda request: web.Response())
+    
+    health_runner = web.AppRunner(app)
+    await health_runner.setup()
+    
+    # Cloud Run binds to 0.0.0.0 and uses PORT env var
+    site = web.TCPSite(health_runner, '0.0.0.0', PORT)
+    await site.start()
+    log.info("🌐 Health check server running on 0.0.0.0:%s (Google Cloud Run)", PORT)
+    log.info("🔗 GroupMe webhook endpoint: https://your-service.a.run.app/groupme/webhook")
+
+async def stop_health_server():
+    """Shut down the health check/webhook server"""
+    if health_runner is not None:
+        log.info("🛑 Health server shutting down...")
+        await health_runner.cleanup()
 
 async def get_groupme_poll(poll_id):
     """Fetch GroupMe poll data using native API"""
     if not GROUPME_ACCESS_TOKEN:
         return None
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            url = f"{GROUPME_POLLS_SHOW_URL}/{poll_id}?token={GROUPME_ACCESS_TOKEN}"
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data.get('poll', {}).get('data', {})
-                else:
-                    print(f"❌ Failed to fetch GroupMe poll {poll_id}. Status: {resp.status}")
-                    return None
-        except Exception as e:
-            print(f"❌ Error fetching GroupMe poll: {e}")
-            return None
+    session = get_http_session()
+    try:
+        url = f"{GROUPME_POLLS_SHOW_URL}/{poll_id}"
+        async with groupme_slots, session.get(url, headers=GROUPME_AUTH_HEADERS) as resp:
+            if resp.status == 200:
+                data = await read_json(resp)
+                return data.get('poll', {}).get('data', {})
+            else:
+                log.error("❌ Failed to fetch GroupMe poll %s. Status: %s", poll_id, resp.status)
+                return None
+    except Exception:
+        log.exception("❌ Error fetching GroupMe poll")
+        return None
+
+async def get_groupme_poll_cached(poll_id):
+    """Fetch GroupMe poll data for display, sharing recent and in-flight lookups of the same poll"""
+    poll_data = groupme_poll_cache.get(poll_id)
+    if poll_data is not None:
+        return poll_data
+    
+    # Shield the shared fetch so one cancelled caller doesn't cancel it for the rest
+    fetch = poll_fetches.get(poll_id)
+    if fetch is None:
+        fetch = poll_fetches[poll_id] = asyncio.ensure_future(get_groupme_poll(poll_id))
+        fetch.add_done_callback(lambda _: poll_fetches.pop(poll_id, None))
+    poll_data = await asyncio.shield(fetch)
+    if poll_data:
+        groupme_poll_cache[poll_id] = poll_data
+    return poll_data
 
 async def handle_groupme_webhook_event(data):
     """Handle incoming GroupMe webhook events including native poll events"""
@@ -157,26 +422,26 @@ async def handle_groupme_webhook_event(data):
         event_type = event.get('type', '')
         
         if event_type == 'poll.created':
-            print("📊 GroupMe poll created event detected")
+            log.info("📊 GroupMe poll created event detected")
             await handle_groupme_poll_created(data)
         elif event_type == 'poll.vote':
-            print("🗳️ GroupMe poll vote event detected")
+            log.info("🗳️ GroupMe poll vote event detected")
             await handle_groupme_poll_vote(data)
         elif event_type == 'poll.ended':
-            print("📊 GroupMe poll ended event detected")
+            log.info("📊 GroupMe poll ended event detected")
             await handle_groupme_poll_ended(data)
         else:
-            # Handle regular messages
+            # Handle regular messages; our own bot's posts (including relayed polls) echo back here
             if data.get('sender_type') != 'bot' and data.get('name', '') != 'Bot':
                 await forward_groupme_to_discord(data)
-            
-            # Also check for text-based poll patterns in regular messages
-            message_text = data.get('text', '')
-            if message_text and ('poll:' in message_text.lower() or '📊' in message_text):
-                await handle_groupme_text_poll(data)
                 
-    except Exception as e:
-        print(f"❌ Error processing GroupMe webhook event: {e}")
+                # Also check for text-based poll patterns in regular messages
+                message_text = data.get('text', '')
+                if message_text and GROUPME_POLL_TRIGGER.search(message_text):
+                    await handle_groupme_text_poll(data)
+                
+    except Exception:
+        log.exception("❌ Error processing GroupMe webhook event")
 
 async def handle_groupme_poll_created(data):
     """Handle native GroupMe poll creation and forward to Discord"""
@@ -190,23 +455,23 @@ async def handle_groupme_poll_created(data):
         author_name = user_data.get('nickname', 'Unknown')
         
         if not poll_id:
-            print("❌ No poll ID found in GroupMe poll created event")
+            log.error("❌ No poll ID found in GroupMe poll created event")
             return
         
         # Fetch full poll data
         full_poll_data = await get_groupme_poll(poll_id)
         if not full_poll_data:
-            print(f"❌ Could not fetch full poll data for {poll_id}")
+            log.error("❌ Could not fetch full poll data for %s", poll_id)
             return
         
         options = [opt.get('title', '') for opt in full_poll_data.get('options', [])]
         
         if len(options) < 2:
-            print("❌ GroupMe poll has insufficient options")
+            log.error("❌ GroupMe poll has insufficient options")
             return
         
         # Create corresponding Discord poll
-        discord_channel = bot.get_channel(DISCORD_CHANNEL_ID)
+        discord_channel = get_discord_channel()
         if discord_channel:
             await create_discord_poll_from_groupme_native(discord_channel, {
                 'question': poll_subject,
@@ -214,8 +479,8 @@ async def handle_groupme_poll_created(data):
                 'poll_id': poll_id
             }, author_name)
             
-    except Exception as e:
-        print(f"❌ Error handling GroupMe poll creation: {e}")
+    except Exception:
+        log.exception("❌ Error handling GroupMe poll creation")
 
 async def create_discord_poll_from_groupme_native(channel, poll_data, author_name):
     """Create a Discord poll from native GroupMe poll data"""
@@ -244,22 +509,15 @@ async def create_discord_poll_from_groupme_native(channel, poll_data, author_nam
         
         # Track the poll for vote synchronization
         poll_id = f"groupme_{groupme_poll_id}"
-        active_polls[poll_id] = {
-            'discord_message': poll_message,
-            'discord_poll': poll,
-            'groupme_poll_id': groupme_poll_id,
-            'author': author_name,
-            'created_at': time.time(),
-            'source': 'groupme',
-            'options': options
-        }
+        track_poll(poll_id, TrackedPoll('groupme', poll_message, poll, groupme_poll_id, author_name,
+                                        question, options))
         
         groupme_poll_mapping[groupme_poll_id] = poll_id
         
-        print(f"✅ Created Discord poll from native GroupMe poll: {question}")
+        log.info("✅ Created Discord poll from native GroupMe poll: %s", question)
         
-    except Exception as e:
-        print(f"❌ Error creating Discord poll from native GroupMe: {e}")
+    except Exception:
+        log.exception("❌ Error creating Discord poll from native GroupMe")
 
 async def handle_groupme_poll_vote(data):
     """Handle GroupMe poll vote events and sync to Discord"""
@@ -275,14 +533,12 @@ async def handle_groupme_poll_vote(data):
         
         if poll_id in groupme_poll_mapping:
             # This is a tracked poll, send notification to Discord
-            discord_channel = bot.get_channel(DISCORD_CHANNEL_ID)
+            discord_channel = get_discord_channel()
             if discord_channel:
-                vote_notification = f"🗳️ **{user_name}** voted for: **{option_title}**"
-                await discord_channel.send(vote_notification)
-                print(f"✅ Forwarded GroupMe vote to Discord: {user_name} -> {option_title}")
+                await queue_notice('discord', f"🗳️ **{user_name}** voted for: **{option_title}**")
         
-    except Exception as e:
-        print(f"❌ Error handling GroupMe poll vote: {e}")
+    except Exception:
+        log.exception("❌ Error handling GroupMe poll vote")
 
 async def handle_groupme_poll_ended(data):
     """Handle GroupMe poll end events"""
@@ -295,29 +551,25 @@ async def handle_groupme_poll_ended(data):
         
         if poll_id in groupme_poll_mapping:
             # Send poll results to Discord
-            discord_channel = bot.get_channel(DISCORD_CHANNEL_ID)
+            discord_channel = get_discord_channel()
             if discord_channel:
                 # Fetch final poll results
                 final_poll_data = await get_groupme_poll(poll_id)
                 if final_poll_data:
-                    results_text = f"📊 **Poll Ended:** {poll_subject}\n\n**Results:**\n"
-                    
-                    for option in final_poll_data.get('options', []):
-                        title = option.get('title', 'Unknown')
-                        votes = option.get('votes', 0)
-                        results_text += f"• **{title}**: {votes} votes\n"
+                    results = ''.join(f"• **{option.get('title', 'Unknown')}**: {option.get('votes', 0)} votes\n"
+                                      for option in final_poll_data.get('options', []))
+                    results_text = f"📊 **Poll Ended:** {poll_subject}\n\n**Results:**\n{results}"
                     
                     await discord_channel.send(results_text)
-                    print(f"✅ Sent GroupMe poll results to Discord")
+                    log.info("✅ Sent GroupMe poll results to Discord")
                 
                 # Clean up tracking
                 tracked_poll_id = groupme_poll_mapping.get(poll_id)
                 if tracked_poll_id:
-                    active_polls.pop(tracked_poll_id, None)
-                    groupme_poll_mapping.pop(poll_id, None)
+                    forget_poll(tracked_poll_id)
         
-    except Exception as e:
-        print(f"❌ Error handling GroupMe poll end: {e}")
+    except Exception:
+        log.exception("❌ Error handling GroupMe poll end")
 
 async def handle_groupme_text_poll(data):
     """Handle text-based poll patterns from GroupMe (fallback)"""
@@ -327,58 +579,37 @@ async def handle_groupme_text_poll(data):
         
         # Parse poll from message text
         poll_data = parse_groupme_poll_text(message_text)
-        if poll_data and len(poll_data['options']) >= 2:
+        if poll_data and len(poll_data.options) >= 2:
             # Create corresponding Discord poll
-            discord_channel = bot.get_channel(DISCORD_CHANNEL_ID)
+            discord_channel = get_discord_channel()
             if discord_channel:
                 await create_discord_poll_from_groupme_native(discord_channel, {
-                    'question': poll_data['question'],
-                    'options': poll_data['options'],
+                    'question': poll_data.question,
+                    'options': poll_data.options,
                     'poll_id': f"text_{int(time.time())}"  # Generate fake ID for text polls
                 }, sender_name)
                 
-    except Exception as e:
-        print(f"❌ Error handling GroupMe text poll: {e}")
+    except Exception:
+        log.exception("❌ Error handling GroupMe text poll")
 
 async def create_groupme_poll_from_discord(poll, author_name, discord_message):
     """Create a native GroupMe poll from Discord poll using GroupMe's poll API"""
     try:
         if not GROUPME_ACCESS_TOKEN:
-            print("❌ GROUPME_ACCESS_TOKEN required for native polls")
+            log.error("❌ GROUPME_ACCESS_TOKEN required for native polls")
             return False
             
-        print(f"🔍 Creating native GroupMe poll from Discord poll...")
-        print(f"🔍 Poll object type: {type(poll)}")
-        
-        # Extract question - handle different possible formats
-        if hasattr(poll.question, 'text'):
-            question = poll.question.text
-        elif hasattr(poll, 'question') and isinstance(poll.question, str):
-            question = poll.question
-        else:
-            question = str(poll.question)
+        log.debug("🔍 Creating native GroupMe poll from Discord poll...")
+        log.debug("🔍 Poll object type: %s", type(poll))
         
-        print(f"📊 Extracted question: {question}")
+        question = poll_question_text(poll)
+        log.debug("📊 Extracted question: %s", question)
         
-        # Extract options - handle different possible formats
-        options = []
-        if hasattr(poll, 'answers'):
-            for answer in poll.answers:
-                if hasattr(answer, 'text'):
-                    options.append(answer.text)
-                else:
-                    options.append(str(answer))
-        elif hasattr(poll, 'options'):
-            for option in poll.options:
-                if hasattr(option, 'text'):
-                    options.append(option.text)
-                else:
-                    options.append(str(option))
-        
-        print(f"📊 Extracted options: {options}")
+        options = poll_option_texts(poll)
+        log.debug("📊 Extracted options: %s", options)
         
         if not options or len(options) < 2:
-            print("❌ Need at least 2 poll options")
+            log.error("❌ Need at least 2 poll options")
             return False
         
         # Prepare GroupMe poll data
@@ -398,53 +629,37 @@ async def create_groupme_poll_from_discord(poll, author_name, discord_message):
             "visibility": "public"
         }
         
-        print(f"📊 Creating GroupMe poll with payload: {poll_payload}")
+        log.debug("📊 Creating GroupMe poll with payload: %s", poll_payload)
         
         # Create the poll using GroupMe's native API
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{GROUPME_POLLS_CREATE_URL}?token={GROUPME_ACCESS_TOKEN}",
-                json=poll_payload,
-                headers={'Content-Type': 'application/json'}
-            ) as response:
-                response_text = await response.text()
-                print(f"🔍 GroupMe poll response status: {response.status}")
-                print(f"🔍 GroupMe poll response: {response_text}")
+        status, response_text = await post_groupme_poll(poll_payload)
+        log.debug("🔍 GroupMe poll response status: %s", status)
+        log.debug("🔍 GroupMe poll response: %s", response_text)
+        
+        if status == 201:  # Created
+            poll_data = orjson.loads(response_text)
+            groupme_poll = poll_data.get('poll', {}).get('data', {})
+            groupme_poll_id = groupme_poll.get('id')
+            
+            log.info("✅ Created native GroupMe poll with ID: %s", groupme_poll_id)
+            
+            # Track the poll for vote synchronization
+            poll_id = f"discord_{discord_message.id}"
+            track_poll(poll_id, TrackedPoll('discord', discord_message, poll, groupme_poll_id, author_name,
+                                            question, options, groupme_poll_data=groupme_poll,
+                                            option_by_emoji=poll_option_emojis(poll)))
+            
+            poll_mapping[discord_message.id] = poll_id
+            groupme_poll_mapping[groupme_poll_id] = poll_id
+            
+            log.info("✅ Successfully created native GroupMe poll: %s", question)
+            return True
+        else:
+            log.error("❌ Failed to create GroupMe poll. Status: %s, Response: %s", status, response_text)
+            return False
                 
-                if response.status == 201:  # Created
-                    poll_data = await response.json()
-                    groupme_poll = poll_data.get('poll', {}).get('data', {})
-                    groupme_poll_id = groupme_poll.get('id')
-                    
-                    print(f"✅ Created native GroupMe poll with ID: {groupme_poll_id}")
-                    
-                    # Track the poll for vote synchronization
-                    poll_id = f"discord_{discord_message.id}"
-                    active_polls[poll_id] = {
-                        'discord_message': discord_message,
-                        'discord_poll': poll,
-                        'groupme_poll_id': groupme_poll_id,
-                        'groupme_poll_data': groupme_poll,
-                        'author': author_name,
-                        'created_at': time.time(),
-                        'source': 'discord',
-                        'options': options
-                    }
-                    
-                    poll_mapping[discord_message.id] = poll_id
-                    groupme_poll_mapping[groupme_poll_id] = poll_id
-                    
-                    print(f"✅ Successfully created native GroupMe poll: {question}")
-                    return True
-                else:
-                    print(f"❌ Failed to create GroupMe poll. Status: {response.status}, Response: {response_text}")
-                    return False
-                    
-    except Exception as e:
-        print(f"❌ Error creating native GroupMe poll: {e}")
-        print(f"❌ Exception type: {type(e)}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
+    except Exception:
+        log.exception("❌ Error creating native GroupMe poll")
         return False
 
 async def forward_groupme_to_discord(data):
@@ -454,7 +669,7 @@ async def forward_groupme_to_discord(data):
         message_text = data.get('text', '')
         
         if message_text and sender_name != 'Bot':
-            discord_channel = bot.get_channel(DISCORD_CHANNEL_ID)
+            discord_channel = get_discord_channel()
             if discord_channel:
                 formatted_message = f"**{sender_name}**: {message_text}"
                 sent_message = await discord_channel.send(formatted_message)
@@ -464,46 +679,68 @@ async def forward_groupme_to_discord(data):
                 if groupme_msg_id:
                     groupme_to_discord[groupme_msg_id] = sent_message.id
                     message_mapping[sent_message.id] = groupme_msg_id
+                    # The webhook payload is the message, so reactions to it never need a fetch
+                    groupme_message_cache[groupme_msg_id] = data
                 
-                print(f"✅ Forwarded GroupMe message to Discord: {message_text[:50]}...")
+                log.info("✅ Forwarded GroupMe message to Discord: %s...", message_text[:50])
                 
     except Exception as e:
-        print(f"❌ Error forwarding GroupMe message to Discord: {e}")
+        log.error("❌ Error forwarding GroupMe message to Discord: %s", e)
+
+async def fetch_groupme_page(limit, before_id=None):
+    """Fetch a page of GroupMe messages into the cache; returns the oldest ID on the page, or None"""
+    params = {'limit': limit}
+    if before_id:
+        params['before_id'] = before_id
+    try:
+        async with groupme_slots, get_http_session().get(GROUPME_MESSAGES_URL, params=params,
+                                                         headers=GROUPME_AUTH_HEADERS) as resp:
+            if resp.status != 200:
+                log.error("❌ Failed to fetch GroupMe messages. Status: %s", resp.status)
+                return None
+            data = await read_json(resp)
+    except Exception as e:
+        log.error("❌ Error fetching GroupMe message: %s", e)
+        return None
+    messages = data.get('response', {}).get('messages', [])
+    # Cache every message we paid for, not just the one requested
+    groupme_message_cache.update({msg['id']: msg for msg in messages})
+    return messages[-1]['id'] if messages else None
 
 async def get_groupme_message(message_id):
     """Fetch a specific GroupMe message by ID"""
+    global recent_page_fetch
     if not GROUPME_ACCESS_TOKEN or not GROUPME_GROUP_ID:
         return None
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            url = f"{GROUPME_MESSAGES_URL}?token={GROUPME_ACCESS_TOKEN}&limit=100"
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    messages = data.get('response', {}).get('messages', [])
-                    for msg in messages:
-                        if msg.get('id') == message_id:
-                            return msg
-                    return None
-                else:
-                    print(f"❌ Failed to fetch GroupMe messages. Status: {resp.status}")
-                    return None
-        except Exception as e:
-            print(f"❌ Error fetching GroupMe message: {e}")
-            return None
+    # Serve repeat reactions on the same (or nearby) message from memory
+    cached_msg = groupme_message_cache.get(message_id)
+    if cached_msg is not None:
+        return cached_msg
+    
+    # Reactions arrive in bursts, so concurrent misses share one in-flight fetch of the
+    # latest small page; shield it so one cancelled caller doesn't cancel it for the rest
+    if recent_page_fetch is None or recent_page_fetch.done():
+        recent_page_fetch = asyncio.ensure_future(fetch_groupme_page(20))
+    oldest_id = await asyncio.shield(recent_page_fetch)
+    if message_id in groupme_message_cache or oldest_id is None:
+        return groupme_message_cache.get(message_id)
+    
+    # Older message: page further back, skipping what we already have; misses behind the
+    # same recent page all want the same older page, so they share that fetch too
+    fetch = older_page_fetches.get(oldest_id)
+    if fetch is None:
+        fetch = older_page_fetches[oldest_id] = asyncio.ensure_future(fetch_groupme_page(100, before_id=oldest_id))
+        fetch.add_done_callback(lambda _: older_page_fetches.pop(oldest_id, None))
+    await asyncio.shield(fetch)
+    return groupme_message_cache.get(message_id)
 
 async def send_reaction_to_groupme(message_id, emoji, user_name):
     """Send a reaction as a message to GroupMe"""
     if not GROUPME_ACCESS_TOKEN or not GROUPME_GROUP_ID:
-        print("❌ GroupMe access token or group ID not available for reactions")
+        log.error("❌ GroupMe access token or group ID not available for reactions")
         return False
     
-    # Check if this is a poll vote
-    poll_vote_handled = await handle_poll_vote_to_groupme(message_id, emoji, user_name)
-    if poll_vote_handled:
-        return True
-    
     # Get the original message to provide context
     original_msg = await get_groupme_message(message_id)
     if original_msg:
@@ -513,181 +750,407 @@ async def send_reaction_to_groupme(message_id, emoji, user_name):
     else:
         context = "a message"
     
-    reaction_text = f"{user_name} reacted {emoji} to {context}"
-    
-    payload = {
-        "bot_id": GROUPME_BOT_ID,
-        "text": reaction_text
-    }
-    
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(GROUPME_POST_URL, json=payload) as response:
-                if response.status == 202:
-                    print(f"✅ Reaction sent to GroupMe: {reaction_text}")
-                    return True
-                else:
-                    print(f"❌ Failed to send reaction to GroupMe. Status: {response.status}")
-                    return False
-        except Exception as e:
-            print(f"❌ Error sending reaction to GroupMe: {e}")
-            return False
+    return await queue_reaction_text(user_name, emoji, context)
+
+async def queue_reaction_text(user_name, emoji, context):
+    """Queue a reaction notice for GroupMe - shared by GroupMe- and Discord-originated reactions"""
+    return await queue_notice('groupme', REACTION_TEMPLATE.format(user_name, emoji, context))
+
+class TrackedPoll:
+    """A bridged poll we sync votes and expiry for; slotted since many can be in flight"""
+    __slots__ = ('source', 'discord_message', 'discord_poll', 'groupme_poll_id', 'groupme_poll_data',
+                 'author', 'question', 'options', 'option_by_emoji', 'created_at', 'expires_at')
+
+    def __init__(self, source, discord_message, discord_poll, groupme_poll_id, author, question, options,
+                 groupme_poll_data=None, option_by_emoji=None):
+        self.source = source  # 'discord' or 'groupme', whichever side the poll started on
+        self.discord_message = discord_message
+        self.discord_poll = discord_poll
+        self.groupme_poll_id = groupme_poll_id
+        self.groupme_poll_data = groupme_poll_data
+        self.author = author
+        self.question = question  # Plain-text question, extracted once for listings
+        self.options = options
+        self.option_by_emoji = option_by_emoji or {}  # Reaction emoji -> option text, built once per poll
+        self.created_at = time.monotonic()
+        self.expires_at = self.created_at + POLL_TTL
+
+def track_poll(poll_id, poll):
+    """Start tracking a poll for vote sync and expiry, forgetting the oldest polls past the cap"""
+    active_polls.pop(poll_id, None)  # Re-inserting moves a re-created poll to the newest end
+    active_polls[poll_id] = poll
+    heapq.heappush(poll_expiry_heap, (poll.expires_at, poll_id))
+    while len(active_polls) > MAX_ACTIVE_POLLS:
+        forget_poll(next(iter(active_polls)))
+
+def forget_poll(poll_id):
+    """Drop a poll and its Discord/GroupMe ID mappings so the indexes don't outlive it"""
+    poll = active_polls.pop(poll_id, None)
+    if poll is None:
+        return
+    if poll.source == 'discord':
+        poll_mapping.pop(poll.discord_message.id, None)
+    groupme_poll_mapping.pop(poll.groupme_poll_id, None)
+    # Votes on a finished poll can't loop any more, so stop tracking them
+    for user_name in poll_voters.pop(poll_id, ()):
+        poll_vote_tracking.pop((poll_id, user_name), None)
 
 async def handle_poll_vote_to_groupme(message_id, emoji, user_name):
     """Handle poll votes from Discord to GroupMe"""
     try:
-        # Check if this reaction is on a poll message
-        for poll_id, poll_data in active_polls.items():
-            if (poll_data.get('source') == 'discord' and 
-                poll_data['discord_message'].id == message_id):
-                
-                # Check if emoji corresponds to a poll option
-                option_emojis = poll_data.get('option_emojis', [])
-                if emoji in option_emojis:
-                    option_index = option_emojis.index(emoji)
-                    option_text = poll_data['discord_poll'].answers[option_index].text
-                    
-                    # Prevent vote loops
-                    vote_key = f"{poll_id}_{user_name}"
-                    if vote_key in poll_vote_tracking:
-                        return True  # Already handled
-                    
-                    poll_vote_tracking[vote_key] = {
-                        'option': option_text,
-                        'timestamp': time.time()
-                    }
-                    
-                    # Send vote notification to GroupMe
-                    vote_text = f"🗳️ {user_name} voted for: {option_text}"
-                    payload = {
-                        "bot_id": GROUPME_BOT_ID,
-                        "text": vote_text
-                    }
-                    
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(GROUPME_POST_URL, json=payload) as response:
-                            if response.status == 202:
-                                print(f"✅ Poll vote forwarded to GroupMe: {vote_text}")
-                                return True
-                    
+        # Look the poll up by Discord message ID instead of scanning every active poll
+        poll_id = poll_mapping.get(message_id)
+        poll = active_polls.get(poll_id) if poll_id else None
+        if poll is None:
+            return False
+        
+        # Check if emoji corresponds to a poll option
+        option_text = poll.option_by_emoji.get(emoji)
+        if option_text is not None:
+            # Prevent vote loops
+            vote_key = (poll_id, user_name)
+            if vote_key in poll_vote_tracking:
+                return True  # Already handled
+            
+            expires_at = time.monotonic() + POLL_TTL
+            poll_vote_tracking[vote_key] = (option_text, expires_at)
+            poll_voters[poll_id].add(user_name)
+            heapq.heappush(vote_expiry_heap, (expires_at, vote_key))
+            
+            # Send vote notification to GroupMe
+            return await queue_notice('groupme', f"🗳️ {user_name} voted for: {option_text}")
+            
         return False
-    except Exception as e:
-        print(f"❌ Error handling poll vote to GroupMe: {e}")
+    except Exception:
+        log.exception("❌ Error handling poll vote to GroupMe")
         return False
 
-async def upload_image_to_groupme(image_url):
-    """Download image from Discord and upload to GroupMe"""
+async def capped_chunks(stream, limit):
+    """Yield a download's chunks, failing once more than limit bytes have arrived"""
+    total = 0
+    async for chunk in stream.iter_chunked(64 * 1024):
+        total += len(chunk)
+        if total > limit:
+            raise ValueError(f"image larger than {limit} bytes")
+        yield chunk
+
+async def upload_image_to_groupme(image_url, size=None):
+    """Download image from Discord and upload to GroupMe; size is the attachment's reported size, if known"""
     if not GROUPME_ACCESS_TOKEN:
-        print("❌ GroupMe access token not available for image upload")
+        log.error("❌ GroupMe access token not available for image upload")
+        return None
+    if size and size > MAX_IMAGE_BYTES:
+        log.warning("⚠️ Skipping image larger than %s bytes: %s", MAX_IMAGE_BYTES, size)
         return None
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(image_url) as resp:
-                if resp.status == 200:
-                    image_data = await resp.read()
-                    print(f"📥 Downloaded image from Discord ({len(image_data)} bytes)")
-                else:
-                    print(f"❌ Failed to download image from Discord. Status: {resp.status}")
-                    return None
+    session = get_http_session()
+    try:
+        async with session.get(image_url, timeout=IMAGE_TRANSFER_TIMEOUT) as download:
+            if download.status != 200:
+                log.error("❌ Failed to download image from Discord. Status: %s", download.status)
+                return None
+            if download.content_length and download.content_length > MAX_IMAGE_BYTES:
+                log.warning("⚠️ Skipping image larger than %s bytes: %s", MAX_IMAGE_BYTES, download.content_length)
+                return None
+            log.info("📥 Streaming image from Discord (%s bytes)", download.content_length or 'unknown')
             
+            # Hand the download stream straight to the upload so the image is never fully buffered in RAM;
+            # chunked responses carry no Content-Length, so the cap is also enforced while streaming
+            # Name the file after the served type so GroupMe doesn't treat JPEG/WebP/GIF as PNG
+            content_type = download.headers.get('Content-Type', 'image/png')
+            mime_type = content_type.partition(';')[0].strip()
+            extension = (mime_type.startswith('image/') and mimetypes.guess_extension(mime_type)) or '.png'
             data = aiohttp.FormData()
-            data.add_field('file', image_data, filename='discord_image.png', content_type='image/png')
+            data.add_field('file', capped_chunks(download.content, MAX_IMAGE_BYTES), filename=f'discord_image{extension}', content_type=content_type)
             
             async with session.post(
                 GROUPME_IMAGE_UPLOAD_URL,
                 data=data,
-                headers={'X-Access-Token': GROUPME_ACCESS_TOKEN}
+                headers=GROUPME_AUTH_HEADERS,
+                timeout=IMAGE_TRANSFER_TIMEOUT
             ) as resp:
                 if resp.status == 200:
-                    result = await resp.json()
+                    result = await read_json(resp)
                     groupme_image_url = result['payload']['url']
-                    print(f"📤 Successfully uploaded image to GroupMe: {groupme_image_url}")
+                    log.info("📤 Successfully uploaded image to GroupMe: %s", groupme_image_url)
                     return groupme_image_url
                 else:
-                    print(f"❌ Failed to upload image to GroupMe. Status: {resp.status}")
+                    log.error("❌ Failed to upload image to GroupMe. Status: %s", resp.status)
                     return None
-                    
-        except Exception as e:
-            print(f"❌ Error handling image upload: {e}")
-            return None
+                
+    except Exception as e:
+        log.error("❌ Error handling image upload: %s", e)
+        return None
+
+def poll_question_text(poll):
+    """Return a Discord poll's question as plain text"""
+    question = poll.question
+    return question if isinstance(question, str) else str(getattr(question, 'text', question))
+
+def poll_option_texts(poll):
+    """Return the answer texts of a Discord poll"""
+    choices = poll.answers if POLL_HAS_ANSWERS else poll.options
+    return [str(getattr(choice, 'text', choice)) for choice in choices]
+
+def poll_option_emojis(poll):
+    """Map the emoji of each Discord poll answer to its text"""
+    if not POLL_HAS_ANSWERS:
+        return {}
+    return {str(answer.emoji): answer.text for answer in poll.answers if answer.emoji}
+
+def option_texts(parts):
+    """Strip list markers and whitespace from poll option parts, dropping any left empty"""
+    options = (OPTION_PATTERN.match(part).group(1) for part in parts)
+    return [option for option in options if option]
+
+PollParse = namedtuple('PollParse', 'question options')  # Immutable so parses can be cached and shared
+
+@lru_cache(maxsize=1024)  # Re-forwards and copy-pasted polls repeat the exact same text
+def parse_groupme_poll_text(message_text):
+    """Parse a text poll into its question and options, or return None if it isn't one"""
+    if not message_text:
+        return None
+    
+    # Cheap substring reject so ordinary chat never reaches the regexes
+    if not POLL_KEYWORD_PATTERN.search(message_text):
+        return None
+    
+    for pattern in POLL_PATTERNS:
+        match = pattern.match(message_text.strip())
+        if match:
+            question, rest = match.group(1).strip(), match.group(2).strip()
+            if '\n' in rest:
+                # One option per line; inline markers are only split out of single-line option text
+                options = option_texts(rest.split('\n'))
+            else:
+                for splitter in OPTION_SPLITS:
+                    # Inline markers only count when the options open with one
+                    pieces = splitter.split(rest)
+                    options = [piece.strip() for piece in pieces if piece.strip()]
+                    if not pieces[0].strip() and len(options) >= 2:
+                        break
+                else:
+                    options = option_texts(rest.split(','))
+            return PollParse(question, tuple(options[:10]))
+    
+    return None
+
+@lru_cache(maxsize=4096)
+def format_timestamp(timestamp):
+    """Format an epoch timestamp for display; repeated lookups of the same poll hit the cache"""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S') if timestamp else 'Unknown'
+
+def numbered_options(options):
+    """Render up to ten poll options as keycap-numbered lines, built in one join"""
+    return '\n'.join(f"{emoji} {option}" for emoji, option in zip(OPTION_EMOJIS, options))
+
+def embed_description(lines):
+    """Join lines into an embed description, clipped to Discord's length limit"""
+    text = "\n".join(lines)
+    if len(text) > EMBED_DESCRIPTION_LIMIT:
+        text = text[:EMBED_DESCRIPTION_LIMIT - 1] + "…"
+    return text
 
 def detect_reply_context(message_content):
     """Detect if a message is replying to another message and extract context"""
-    reply_patterns = [
-        r'^Reply to @(\w+):\s*(.+)',
-        r'^@(\w+)\s+(.+)',
-        r'^>\s*(.+?)\n(.+)',
-        r'^"(.+?)"\s*(.+)'
-    ]
-    
-    for pattern in reply_patterns:
-        match = re.match(pattern, message_content, re.DOTALL)
+    for pattern in REPLY_PATTERNS:
+        match = pattern.match(message_content)
         if match:
             if len(match.groups()) == 2:
                 return match.group(1), match.group(2)
     
     return None, message_content
 
-async def send_to_groupme(message_text, author_name, image_url=None, reply_context=None):
-    """Send a message to GroupMe with optional image and reply context"""
-    
+def format_groupme_text(message_text, author_name, reply_context=None):
+    """Build the outgoing GroupMe text, prefixed with reply context when there is any"""
     if reply_context:
         quoted_text, reply_author = reply_context
-        message_text = f"↪️ Replying to {reply_author}: \"{quoted_text[:50]}{'...' if len(quoted_text) > 50 else ''}\"\n\n{author_name}: {message_text}"
+        quote = quoted_text if len(quoted_text) <= 50 else f"{quoted_text[:50]}..."
+        header = f"↪️ Replying to {reply_author}: \"{quote}\"\n\n"
     else:
-        reply_author, clean_message = detect_reply_context(message_text)
-        if reply_author:
-            message_text = f"↪️ Replying to {reply_author}:\n\n{author_name}: {clean_message}"
-        else:
-            message_text = f"{author_name}: {message_text}" if message_text.strip() else f"{author_name} sent an image"
+        # Only parse the text for reply markers when Discord gave us no reply reference
+        reply_author, message_text = detect_reply_context(message_text)
+        header = f"↪️ Replying to {reply_author}:\n\n" if reply_author else ""
     
-    payload = {
-        "bot_id": GROUPME_BOT_ID,
-        "text": message_text
-    }
+    if not header and not message_text.strip():
+        return f"{author_name} sent an image"
+    return f"{header}{author_name}: {message_text}"
+
+async def send_to_groupme(message_text, author_name, image_urls=None, reply_context=None):
+    """Send a message to GroupMe with optional images and reply context"""
+    message_text = format_groupme_text(message_text, author_name, reply_context)
+    
+    payload = groupme_bot_payload(message_text)
     
-    if image_url:
+    if image_urls:
         payload["attachments"] = [{
             "type": "image",
             "url": image_url
-        }]
+        } for image_url in image_urls]
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(GROUPME_POST_URL, json=payload) as response:
-                if response.status == 202:
-                    image_info = " with image" if image_url else ""
-                    print(f"✅ Message sent to GroupMe{image_info}: {message_text[:50]}...")
-                    return True
-                else:
-                    print(f"❌ Failed to send to GroupMe. Status: {response.status}")
-                    return False
-        except Exception as e:
-            print(f"❌ Error sending to GroupMe: {e}")
+    try:
+        status = await post_to_groupme(payload)
+        if status == 202:
+            image_info = f" with {len(image_urls)} image(s)" if image_urls else ""
+            log.info("✅ Message sent to GroupMe%s: %s...", image_info, message_text[:50])
+            return True
+        else:
+            log.error("❌ Failed to send to GroupMe. Status: %s", status)
             return False
+    except Exception as e:
+        log.error("❌ Error sending to GroupMe: %s", e)
+        return False
+
+async def outbound_worker():
+    """Send queued Discord messages to GroupMe one at a time"""
+    while True:
+        args = await outbound_queue.get()
+        try:
+            await send_to_groupme(*args)
+        except Exception:
+            log.exception("❌ Error in outbound GroupMe worker")
+        finally:
+            outbound_queue.task_done()
+
+async def queue_to_groupme(message_text, author_name, image_urls=None, reply_context=None):
+    """Queue a message for GroupMe, waiting only if the queue is full"""
+    await outbound_queue.put((message_text, author_name, image_urls, reply_context))
+
+async def stop_outbound_workers(timeout=5):
+    """Give queued messages a chance to go out, then stop the workers"""
+    try:
+        await asyncio.wait_for(outbound_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        log.warning("⚠️ Dropping %s queued GroupMe message(s) on shutdown", outbound_queue.qsize())
+    for worker in outbound_workers:
+        worker.cancel()
+    await asyncio.gather(*outbound_workers, return_exceptions=True)
+    outbound_workers.clear()
+
+async def queue_notice(target, text):
+    """Queue a reaction/vote notice for the next batched post, waiting only if the queue is full"""
+    await notice_queue.put((target, text))
+    return True
+
+def pack_lines(lines, limit):
+    """Join lines into as few newline-separated messages as fit within limit characters"""
+    chunk = []
+    size = 0
+    for line in lines:
+        line = line[:limit]
+        if chunk and size + 1 + len(line) > limit:
+            yield "\n".join(chunk)
+            chunk, size = [], 0
+        size += len(line) + (1 if chunk else 0)
+        chunk.append(line)
+    if chunk:
+        yield "\n".join(chunk)
+
+async def notice_flusher():
+    """Post queued reaction/vote notices in frame-sized batches instead of one request each"""
+    while True:
+        batch = [await notice_queue.get()]
+        await asyncio.sleep(NOTICE_FRAME_SECONDS)
+        while not notice_queue.empty():
+            batch.append(notice_queue.get_nowait())
+        
+        try:
+            await flush_notices(batch)
+        except Exception:
+            log.exception("❌ Error flushing reaction/vote notices")
+        finally:
+            for _ in batch:
+                notice_queue.task_done()
+
+async def flush_notices(batch):
+    """Post one batch of (target, text) notices, packed into as few messages per platform as fit"""
+    groupme_lines = [text for target, text in batch if target == 'groupme']
+    discord_lines = [text for target, text in batch if target == 'discord']
+    # GroupMe caps bot messages at 1000 characters, Discord at 2000
+    for text in pack_lines(groupme_lines, 1000):
+        status = await post_to_groupme(groupme_bot_payload(text))
+        if status != 202:
+            log.error("❌ Failed to send notices to GroupMe. Status: %s", status)
+    if discord_lines:
+        discord_channel = get_discord_channel()
+        if discord_channel:
+            for text in pack_lines(discord_lines, 2000):
+                await discord_channel.send(text)
+        else:
+            log.warning("⚠️ Discord channel unavailable, dropping %s Discord notice(s)", len(discord_lines))
+    log.info("✅ Flushed %s GroupMe and %s Discord notice(s)", len(groupme_lines), len(discord_lines))
+
+async def stop_notice_flusher(timeout=5):
+    """Give queued notices a chance to go out, then stop the flusher"""
+    global notice_task
+    if notice_task is None:
+        return
+    try:
+        await asyncio.wait_for(notice_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        log.warning("⚠️ Dropping %s queued notice(s) on shutdown", notice_queue.qsize())
+    notice_task.cancel()
+    await asyncio.gather(notice_task, return_exceptions=True)
+    notice_task = None
+
+def start_background_task(coro):
+    """Schedule a long-running coroutine and hold a reference to it until it finishes"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+@bot.event
+async def setup_hook():
+    """Start the background workers on the bot's loop before connecting to Discord"""
+    global notice_task
+    outbound_workers.extend(asyncio.create_task(outbound_worker()) for _ in range(OUTBOUND_WORKERS))
+    start_background_task(cleanup_old_polls())
+    notice_task = asyncio.create_task(notice_flusher())
+    for _ in range(WEBHOOK_WORKERS):
+        start_background_task(webhook_worker())
 
 @bot.event
 async def on_ready():
-    global bot_status
+    global bot_status, bridged_channel
     bot_status["ready"] = True
-    print(f'🤖 {bot.user} has connected to Discord!')
-    print(f'📺 Monitoring channel ID: {DISCORD_CHANNEL_ID}')
-    print(f'🖼️ Image support: {"✅" if GROUPME_ACCESS_TOKEN else "❌ (GROUPME_ACCESS_TOKEN not set)"}')
-    print(f'🔗 GroupMe Group ID: {"✅" if GROUPME_GROUP_ID else "❌ (GROUPME_GROUP_ID not set)"}')
-    print(f'😀 Reaction support: {"✅" if GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID else "❌"}')
-    print(f'📊 Poll support: {"✅" if GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID else "❌"}')
-    print(f'🧵 Threading support: ✅')
-    print(f'☁️ Enhanced bot with poll support is ready and running on Google Cloud Run!')
-    print(f'🌐 Server running on port: {PORT}')
+    # A fresh session rebuilds discord.py's channel cache, so re-resolve on every ready
+    bridged_channel = bot.get_channel(DISCORD_CHANNEL_ID)
+    log.info('🤖 %s has connected to Discord!', bot.user)
+    log.info('📺 Monitoring channel ID: %s', DISCORD_CHANNEL_ID)
+    log.info('🖼️ Image support: %s', "✅" if GROUPME_ACCESS_TOKEN else "❌ (GROUPME_ACCESS_TOKEN not set)")
+    log.info('🔗 GroupMe Group ID: %s', "✅" if GROUPME_GROUP_ID else "❌ (GROUPME_GROUP_ID not set)")
+    log.info('😀 Reaction support: %s', "✅" if GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID else "❌")
+    log.info('📊 Poll support: %s', "✅" if GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID else "❌")
+    log.info('🧵 Threading support: ✅')
+    log.info('☁️ Enhanced bot with poll support is ready and running on Google Cloud Run!')
+    log.info('🌐 Server running on port: %s', PORT)
+    
+    # on_ready fires again after reconnects, so only start the expiry loop once
+    if not expire_recent_messages.is_running():
+        expire_recent_messages.start()
+
+def monitored_channel_only():
+    """Command check that only lets commands run in the bridged channel"""
+    return commands.check(lambda ctx: ctx.channel.id == DISCORD_CHANNEL_ID)
+
+@bot.event
+async def on_command_error(ctx, error):
+    """Answer failed channel checks and bad arguments once here instead of in every command"""
+    if isinstance(error, commands.CommandNotFound):
+        log.debug("🤖 Unknown command: %s", ctx.message.content)
+    elif isinstance(error, commands.CheckFailure):
+        await ctx.send("❌ This command only works in the monitored channel.")
+    elif isinstance(error, commands.UserInputError):
+        await ctx.send(f"❌ {error}\nUsage: `!{ctx.command.qualified_name} {ctx.command.signature}`")
+    else:
+        log.error("❌ Error in command %s", ctx.command, exc_info=error)
+        await ctx.send(f"❌ Command failed: {str(error)[:100]}")
 
 @bot.command(name='webhooktest')
+@monitored_channel_only()
 async def test_webhook(ctx):
     """Test if GroupMe webhook is properly configured"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
-        
     await ctx.send("🔍 **Testing GroupMe Webhook Configuration**")
     
     # Show expected webhook URL
@@ -726,139 +1189,139 @@ async def on_message(message):
     if message.author.bot:
         return
     
-    if message.channel.id == DISCORD_CHANNEL_ID:
-        print(f"📨 Processing message from {message.author.display_name}...")
-        
-        # IMPORTANT: Check if this is a bot command FIRST
-        # Don't forward commands to GroupMe
+    channel_id = message.channel.id
+    if channel_id != DISCORD_CHANNEL_ID:
+        # Outside the bridged channel only commands matter, so skip dispatch for plain chatter
         if message.content.startswith('!'):
-            print(f"🤖 Bot command detected: {message.content}")
             await bot.process_commands(message)
-            return  # Exit early for commands
-        
-        # Enhanced poll detection with multiple checks
-        has_poll = False
-        poll_obj = None
-        
-        # Method 1: Check if message has poll attribute
-        if hasattr(message, 'poll'):
-            print(f"🔍 Message has poll attribute: {message.poll is not None}")
-            if message.poll is not None:
-                has_poll = True
-                poll_obj = message.poll
-                print(f"✅ Poll detected via message.poll")
-        
-        # Method 2: Check message type
-        if hasattr(message, 'type'):
-            print(f"🔍 Message type: {message.type}")
-            if str(message.type) == 'MessageType.poll':
-                has_poll = True
-                print(f"✅ Poll detected via message type")
-        
-        # Method 3: Check for poll in message content/embeds
-        if message.embeds:
-            print(f"🔍 Message has {len(message.embeds)} embeds")
-            for embed in message.embeds:
-                if 'poll' in str(embed.to_dict()).lower():
-                    print(f"🔍 Found poll-related embed")
-        
-        if has_poll and poll_obj:
-            print(f"📊 POLL DETECTED! Processing...")
-            print(f"📊 Poll object type: {type(poll_obj)}")
+        return
+    
+    # Bind hot attributes once; discord.py model attribute access isn't free
+    author_name = message.author.display_name
+    content = message.content
+    log.debug("📨 Processing message from %s...", author_name)
+    
+    # IMPORTANT: Check if this is a bot command FIRST
+    # Don't forward commands to GroupMe
+    if content.startswith('!'):
+        log.debug("🤖 Bot command detected: %s", content)
+        await bot.process_commands(message)
+        return  # Exit early for commands
+    
+    # Enhanced poll detection with multiple checks
+    has_poll = False
+    poll_obj = None
+    
+    # Method 1: Check if message has poll attribute
+    if hasattr(message, 'poll'):
+        log.debug("🔍 Message has poll attribute: %s", message.poll is not None)
+        if message.poll is not None:
+            has_poll = True
+            poll_obj = message.poll
+            log.info("✅ Poll detected via message.poll")
+    
+    # Method 2: Check message type
+    if hasattr(message, 'type'):
+        log.debug("🔍 Message type: %s", message.type)
+        if str(message.type) == 'MessageType.poll':
+            has_poll = True
+            log.info("✅ Poll detected via message type")
+    
+    # Method 3: Check for poll in message content/embeds
+    if message.embeds:
+        log.debug("🔍 Message has %s embeds", len(message.embeds))
+        for embed in message.embeds:
+            if 'poll' in str(embed.to_dict()).lower():
+                log.debug("🔍 Found poll-related embed")
+    
+    if has_poll and poll_obj:
+        log.info("📊 POLL DETECTED! Processing...")
+        log.debug("📊 Poll object type: %s", type(poll_obj))
+        
+        # Extract and log poll details
+        try:
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("📊 Poll question: %s", poll_question_text(poll_obj))
+                log.debug("📊 Poll options: %s", poll_option_texts(poll_obj))
             
-            # Extract and log poll details
-            try:
-                if hasattr(poll_obj, 'question'):
-                    if hasattr(poll_obj.question, 'text'):
-                        question = poll_obj.question.text
-                    else:
-                        question = str(poll_obj.question)
-                    print(f"📊 Poll question: {question}")
-                
-                if hasattr(poll_obj, 'answers'):
-                    options = [str(answer.text) if hasattr(answer, 'text') else str(answer) for answer in poll_obj.answers]
-                    print(f"📊 Poll options: {options}")
-                elif hasattr(poll_obj, 'options'):
-                    options = [str(option.text) if hasattr(option, 'text') else str(option) for option in poll_obj.options]
-                    print(f"📊 Poll options: {options}")
-                
-                # Attempt to create GroupMe poll
-                success = await create_groupme_poll_from_discord(poll_obj, message.author.display_name, message)
-                if success:
-                    await message.add_reaction("✅")
-                    print("✅ Poll forwarding successful")
-                else:
-                    await message.add_reaction("❌")
-                    print("❌ Poll forwarding failed")
-                    # Send debug message
-                    await message.reply("❌ Failed to create GroupMe poll. Check logs for details.")
-                    
-            except Exception as e:
-                print(f"❌ Error processing poll: {e}")
-                import traceback
-                print(f"❌ Traceback: {traceback.format_exc()}")
+            # Attempt to create GroupMe poll
+            success = await create_groupme_poll_from_discord(poll_obj, author_name, message)
+            if success:
+                await message.add_reaction("✅")
+                log.info("✅ Poll forwarding successful")
+            else:
                 await message.add_reaction("❌")
-                await message.reply(f"❌ Poll error: {str(e)[:100]}")
-            return
-        
-        # If no poll detected, log for debugging
-        if not has_poll:
-            print(f"🔍 No poll detected in message from {message.author.display_name}")
-            print(f"🔍 Message content: {message.content[:100]}...")
-        
-        # Check if message content looks like a poll command or text
-        if message.content:
-            poll_keywords = ['poll:', '📊', 'vote:', 'survey:']
-            content_lower = message.content.lower()
-            if any(keyword in content_lower for keyword in poll_keywords):
-                print(f"📊 Potential text-based poll detected: {message.content[:100]}")
-                await handle_text_based_poll(message)
-        
-        # Continue with normal message processing...
-        # Store message for threading context
-        recent_messages[message.channel.id].append({
-            'author': message.author.display_name,
-            'content': message.content,
-            'timestamp': time.time(),
-            'message_id': message.id
-        })
-        
-        # Keep only last 20 messages for context
-        if len(recent_messages[message.channel.id]) > 20:
-            recent_messages[message.channel.id].pop(0)
-        
-        # Handle replies
-        reply_context = None
-        if message.reference and message.reference.message_id:
+                log.error("❌ Poll forwarding failed")
+                # Send debug message
+                await message.reply("❌ Failed to create GroupMe poll. Check logs for details.")
+                
+        except Exception as e:
+            log.exception("❌ Error processing poll")
+            await message.add_reaction("❌")
+            await message.reply(f"❌ Poll error: {str(e)[:100]}")
+        return
+    
+    # If no poll detected, log for debugging
+    if not has_poll:
+        log.debug("🔍 No poll detected in message from %s", author_name)
+        log.debug("🔍 Message content: %.100s...", content)
+    
+    # Check if message content looks like a poll command or text
+    if content:
+        if POLL_KEYWORD_PATTERN.search(content):
+            log.debug("📊 Potential text-based poll detected: %.100s", content)
+            await handle_text_based_poll(message)
+    
+    # Continue with normal message processing...
+    # Store message for threading context
+    recent_messages[channel_id].append({
+        'author': author_name,
+        'content': content,
+        'timestamp': time.monotonic(),
+        'message_id': message.id
+    })  # deque(maxlen=20) drops the oldest entry automatically
+    
+    # Handle replies
+    reply_context = None
+    reference = message.reference
+    if reference and reference.message_id:
+        # discord.py attaches the replied-to message when it's still cached, which saves a REST call
+        replied_message = reference.cached_message
+        if replied_message is None:
             try:
-                replied_message = await message.channel.fetch_message(message.reference.message_id)
-                reply_context = (replied_message.content[:100], replied_message.author.display_name)
-            except:
-                pass
-        
-        # Handle images
-        if message.attachments:
-            for attachment in message.attachments:
-                if attachment.content_type and attachment.content_type.startswith('image/'):
-                    print(f"🖼️ Found image attachment: {attachment.filename}")
-                    groupme_image_url = await upload_image_to_groupme(attachment.url)
-                    
-                    if groupme_image_url:
-                        await send_to_groupme(message.content, message.author.display_name, 
-                                            groupme_image_url, reply_context)
-                    else:
-                        await send_to_groupme(f"{message.content} [Image upload failed]", 
-                                            message.author.display_name, reply_context=reply_context)
-                else:
-                    await send_to_groupme(f"{message.content} [Attached: {attachment.filename}]", 
-                                        message.author.display_name, reply_context=reply_context)
-        else:
-            if message.content.strip():
-                await send_to_groupme(message.content, message.author.display_name, 
-                                    reply_context=reply_context)
+                replied_message = await message.channel.fetch_message(reference.message_id)
+            except discord.HTTPException:
+                pass  # Deleted or inaccessible; forward without reply context
+        if replied_message is not None:
+            reply_context = (replied_message.content[:100], replied_message.author.display_name)
     
-    # Process commands for messages not in the monitored channel too
-    await bot.process_commands(message)
+    # Handle images
+    if message.attachments:
+        image_attachments = []
+        notes = []
+        for attachment in message.attachments:
+            if attachment.content_type and attachment.content_type.startswith('image/'):
+                log.info("🖼️ Found image attachment: %s", attachment.filename)
+                image_attachments.append(attachment)
+            else:
+                notes.append(f"[Attached: {attachment.filename}]")
+        
+        # Upload all images concurrently, then post them to GroupMe as one message
+        results = await asyncio.gather(
+            *(upload_image_to_groupme(attachment.url, attachment.size) for attachment in image_attachments),
+            return_exceptions=True
+        )
+        groupme_image_urls = [url for url in results if isinstance(url, str)]
+        if len(groupme_image_urls) < len(image_attachments):
+            notes.append("[Image upload failed]")
+        
+        message_text = f"{content} {' '.join(notes)}" if notes else content
+        await queue_to_groupme(message_text, author_name, 
+                               groupme_image_urls, reply_context)
+    else:
+        if content.strip():
+            await queue_to_groupme(content, author_name, 
+                                   reply_context=reply_context)
 
 async def handle_text_based_poll(message):
     """Handle text-based poll detection when native polls aren't working"""
@@ -866,19 +1329,12 @@ async def handle_text_based_poll(message):
         content = message.content
         poll_data = parse_groupme_poll_text(content)
         
-        if poll_data and len(poll_data['options']) >= 2:
-            print(f"📊 Text-based poll detected: {poll_data}")
+        if poll_data and len(poll_data.options) >= 2:
+            log.info("📊 Text-based poll detected: %s", poll_data)
             
             # Send formatted poll to GroupMe
-            option_emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
-            
-            poll_text = f"📊 Poll from {message.author.display_name}: {poll_data['question']}\n\n"
-            
-            for i, option in enumerate(poll_data['options'][:10]):
-                emoji = option_emojis[i] if i < len(option_emojis) else f"{i+1}."
-                poll_text += f"{emoji} {option}\n"
-            
-            poll_text += f"\nReact with the corresponding number to vote! 🗳️"
+            poll_text = (f"📊 Poll from {message.author.display_name}: {poll_data.question}\n\n"
+                         f"{numbered_options(poll_data.options)}\n\nReact with the corresponding number to vote! 🗳️")
             
             # Send to GroupMe
             success = await send_to_groupme(poll_text, "Poll Bot")
@@ -887,98 +1343,91 @@ async def handle_text_based_poll(message):
                 await message.reply("Poll forwarded to GroupMe!")
             
     except Exception as e:
-        print(f"❌ Error handling text-based poll: {e}")
+        log.exception("❌ Error handling text-based poll")
         await message.reply(f"Error processing poll: {str(e)[:100]}")
 
 @bot.command(name='polltest')
+@monitored_channel_only()
 async def poll_test(ctx):
     """Test Discord poll creation capabilities with detailed debugging"""
-    if ctx.channel.id == DISCORD_CHANNEL_ID:
-        await ctx.send("🔍 Testing Discord poll support step by step...")
+    await ctx.send("🔍 Testing Discord poll support step by step...")
+    
+    # Check if discord.py supports polls
+    try:
+        import discord
+        await ctx.send(f"📋 Discord.py version: **{discord.__version__}**")
         
-        # Check if discord.py supports polls
-        try:
-            import discord
-            await ctx.send(f"📋 Discord.py version: **{discord.__version__}**")
+        # Check if Poll class exists
+        if hasattr(discord, 'Poll'):
+            await ctx.send("✅ Poll class found in discord.py")
             
-            # Check if Poll class exists
-            if hasattr(discord, 'Poll'):
-                await ctx.send("✅ Poll class found in discord.py")
+            # Check if PollMedia exists
+            if hasattr(discord, 'PollMedia'):
+                await ctx.send("✅ PollMedia class found")
                 
-                # Check if PollMedia exists
-                if hasattr(discord, 'PollMedia'):
-                    await ctx.send("✅ PollMedia class found")
+                # Try to create a simple poll
+                try:
+                    poll_options = [
+                        discord.PollMedia(text="Yes", emoji="✅"),
+                        discord.PollMedia(text="No", emoji="❌")
+                    ]
                     
-                    # Try to create a simple poll
-                    try:
-                        poll_options = [
-                            discord.PollMedia(text="Yes", emoji="✅"),
-                            discord.PollMedia(text="No", emoji="❌")
-                        ]
-                        
-                        poll = discord.Poll(
-                            question="🧪 Test: Can you see this Discord poll?",
-                            options=poll_options,
-                            multiple=False,
-                            duration=1  # 1 hour
-                        )
-                        
-                        await ctx.send("✅ Poll object created successfully")
-                        
-                        # Send the poll
-                        poll_msg = await ctx.send(poll=poll)
-                        await ctx.send("✅ Discord poll sent successfully!")
+                    poll = discord.Poll(
+                        question="🧪 Test: Can you see this Discord poll?",
+                        options=poll_options,
+                        multiple=False,
+                        duration=1  # 1 hour
+                    )
+                    
+                    await ctx.send("✅ Poll object created successfully")
+                    
+                    # Send the poll
+                    poll_msg = await ctx.send(poll=poll)
+                    await ctx.send("✅ Discord poll sent successfully!")
+                    
+                    # Debug poll message attributes
+                    await ctx.send(f"🔍 Poll message ID: `{poll_msg.id}`")
+                    await ctx.send(f"🔍 Poll message has poll attribute: `{hasattr(poll_msg, 'poll')}`")
+                    
+                    if hasattr(poll_msg, 'poll') and poll_msg.poll:
+                        await ctx.send("✅ Poll message contains poll data")
                         
-                        # Debug poll message attributes
-                        await ctx.send(f"🔍 Poll message ID: `{poll_msg.id}`")
-                        await ctx.send(f"🔍 Poll message has poll attribute: `{hasattr(poll_msg, 'poll')}`")
+                        # Try to trigger poll forwarding manually
+                        await ctx.send("🔄 Attempting to forward to GroupMe...")
                         
-                        if hasattr(poll_msg, 'poll') and poll_msg.poll:
-                            await ctx.send("✅ Poll message contains poll data")
-                            
-                            # Try to trigger poll forwarding manually
-                            await ctx.send("🔄 Attempting to forward to GroupMe...")
-                            
-                            try:
-                                success = await create_groupme_poll_from_discord(
-                                    poll_msg.poll, 
-                                    ctx.author.display_name, 
-                                    poll_msg
-                                )
-                                if success:
-                                    await ctx.send("✅ **Poll forwarded to GroupMe successfully!**")
-                                else:
-                                    await ctx.send("❌ **Poll forwarding to GroupMe failed**")
-                            except Exception as e:
-                                await ctx.send(f"❌ **Poll forwarding error:** `{str(e)}`")
-                        else:
-                            await ctx.send("❌ Poll message does not contain poll data")
-                            
-                    except Exception as e:
-                        await ctx.send(f"❌ **Failed to create Discord poll:** `{str(e)}`")
-                        import traceback
-                        print(f"Poll creation error: {traceback.format_exc()}")
+                        try:
+                            success = await create_groupme_poll_from_discord(
+                                poll_msg.poll, 
+                                ctx.author.display_name, 
+                                poll_msg
+                            )
+                            if success:
+                                await ctx.send("✅ **Poll forwarded to GroupMe successfully!**")
+                            else:
+                                await ctx.send("❌ **Poll forwarding to GroupMe failed**")
+                        except Exception as e:
+                            await ctx.send(f"❌ **Poll forwarding error:** `{str(e)}`")
+                    else:
+                        await ctx.send("❌ Poll message does not contain poll data")
                         
-                else:
-                    await ctx.send("❌ PollMedia class not found - discord.py version too old")
+                except Exception as e:
+                    await ctx.send(f"❌ **Failed to create Discord poll:** `{str(e)}`")
+                    log.exception("❌ Poll creation error")
                     
             else:
-                await ctx.send("❌ Poll class not found - discord.py version too old")
-                await ctx.send("💡 **Solution:** Update discord.py: `pip install discord.py>=2.3.0`")
+                await ctx.send("❌ PollMedia class not found - discord.py version too old")
                 
-        except Exception as e:
-            await ctx.send(f"❌ **Error checking Discord.py:** `{str(e)}`")
+        else:
+            await ctx.send("❌ Poll class not found - discord.py version too old")
+            await ctx.send("💡 **Solution:** Update discord.py: `pip install discord.py>=2.3.0`")
             
-    else:
-        await ctx.send("❌ This command only works in the monitored channel.")
+    except Exception as e:
+        await ctx.send(f"❌ **Error checking Discord.py:** `{str(e)}`")
 
 @bot.command(name='groupmetest')
+@monitored_channel_only()
 async def test_groupme_polls(ctx):
     """Test GroupMe poll API access"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
-        
     await ctx.send("🔍 Testing GroupMe poll API access...")
     
     # Check environment variables
@@ -998,20 +1447,20 @@ async def test_groupme_polls(ctx):
     await ctx.send("🔍 Testing basic GroupMe API access...")
     
     try:
-        async with aiohttp.ClientSession() as session:
-            # Test getting group info
-            async with session.get(f"{GROUPME_GROUPS_URL}?token={GROUPME_ACCESS_TOKEN}") as response:
-                if response.status == 200:
-                    group_data = await response.json()
-                    group_name = group_data.get('response', {}).get('name', 'Unknown')
-                    await ctx.send(f"✅ **GroupMe API access successful**")
-                    await ctx.send(f"📋 Group name: **{group_name}**")
-                else:
-                    await ctx.send(f"❌ **GroupMe API failed:** Status {response.status}")
-                    error_text = await response.text()
-                    await ctx.send(f"Error: `{error_text[:200]}...`")
-                    return
-                    
+        session = get_http_session()
+        # Test getting group info
+        async with groupme_slots, session.get(GROUPME_GROUPS_URL, headers=GROUPME_AUTH_HEADERS) as response:
+            if response.status == 200:
+                group_data = await read_json(response)
+                group_name = group_data.get('response', {}).get('name', 'Unknown')
+                await ctx.send(f"✅ **GroupMe API access successful**")
+                await ctx.send(f"📋 Group name: **{group_name}**")
+            else:
+                await ctx.send(f"❌ **GroupMe API failed:** Status {response.status}")
+                error_text = await response.text()
+                await ctx.send(f"Error: `{error_text[:200]}...`")
+                return
+                
     except Exception as e:
         await ctx.send(f"❌ **GroupMe API error:** `{str(e)}`")
         return
@@ -1032,42 +1481,33 @@ async def test_groupme_polls(ctx):
             "visibility": "public"
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{GROUPME_POLLS_CREATE_URL}?token={GROUPME_ACCESS_TOKEN}",
-                json=poll_payload,
-                headers={'Content-Type': 'application/json'}
-            ) as response:
-                response_text = await response.text()
-                
-                if response.status == 201:
-                    poll_data = await response.json()
-                    poll_id = poll_data.get('poll', {}).get('data', {}).get('id', 'Unknown')
-                    await ctx.send(f"✅ **GroupMe poll created successfully!**")
-                    await ctx.send(f"📋 Poll ID: `{poll_id}`")
-                    await ctx.send("🎉 **Poll API is working correctly!**")
-                else:
-                    await ctx.send(f"❌ **GroupMe poll creation failed:** Status {response.status}")
-                    await ctx.send(f"Response: `{response_text[:300]}...`")
+        status, response_text = await post_groupme_poll(poll_payload)
+        
+        if status == 201:
+            poll_data = orjson.loads(response_text)
+            poll_id = poll_data.get('poll', {}).get('data', {}).get('id', 'Unknown')
+            await ctx.send(f"✅ **GroupMe poll created successfully!**")
+            await ctx.send(f"📋 Poll ID: `{poll_id}`")
+            await ctx.send("🎉 **Poll API is working correctly!**")
+        else:
+            await ctx.send(f"❌ **GroupMe poll creation failed:** Status {status}")
+            await ctx.send(f"Response: `{response_text[:300]}...`")
+            
+            # Common error diagnostics
+            if status == 401:
+                await ctx.send("💡 **Error 401:** Invalid access token")
+            elif status == 403:
+                await ctx.send("💡 **Error 403:** Access token doesn't have poll permissions")
+            elif status == 404:
+                await ctx.send("💡 **Error 404:** Invalid group ID or poll endpoint")
                     
-                    # Common error diagnostics
-                    if response.status == 401:
-                        await ctx.send("💡 **Error 401:** Invalid access token")
-                    elif response.status == 403:
-                        await ctx.send("💡 **Error 403:** Access token doesn't have poll permissions")
-                    elif response.status == 404:
-                        await ctx.send("💡 **Error 404:** Invalid group ID or poll endpoint")
-                        
     except Exception as e:
         await ctx.send(f"❌ **Poll creation test error:** `{str(e)}`")
 
 @bot.command(name='debugenv')
+@monitored_channel_only()
 async def debug_environment(ctx):
     """Show detailed environment debug info"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
-        
     # Don't show actual tokens, just their presence/format
     token_preview = GROUPME_ACCESS_TOKEN[:10] + "..." if GROUPME_ACCESS_TOKEN else "Not set"
     
@@ -1103,12 +1543,9 @@ async def debug_environment(ctx):
     await ctx.send(debug_info)
 
 @bot.command(name='textpoll')
+@monitored_channel_only()
 async def text_poll(ctx, *, poll_text):
     """Create a text-based poll that works regardless of Discord poll support"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
-    
     try:
         # Parse poll text
         if '?' not in poll_text:
@@ -1125,50 +1562,38 @@ async def text_poll(ctx, *, poll_text):
             return
         
         # Create poll text for both platforms
-        option_emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
-        
-        discord_poll_text = f"📊 **{question}?**\n\n"
-        groupme_poll_text = f"📊 Poll from {ctx.author.display_name}: {question}?\n\n"
-        
-        for i, option in enumerate(options[:10]):
-            emoji = option_emojis[i] if i < len(option_emojis) else f"{i+1}️⃣"
-            discord_poll_text += f"{emoji} {option}\n"
-            groupme_poll_text += f"{emoji} {option}\n"
-        
-        discord_poll_text += "\nReact with the corresponding number to vote!"
-        groupme_poll_text += "\nReact with the corresponding number to vote! 🗳️"
+        option_lines = numbered_options(options)
+        discord_poll_text = f"📊 **{question}?**\n\n{option_lines}\n\nReact with the corresponding number to vote!"
+        groupme_poll_text = (f"📊 Poll from {ctx.author.display_name}: {question}?\n\n"
+                             f"{option_lines}\n\nReact with the corresponding number to vote! 🗳️")
         
         # Send to Discord
         discord_msg = await ctx.send(discord_poll_text)
         
-        # Add reaction options
-        for i in range(min(len(options), 10)):
-            await discord_msg.add_reaction(option_emojis[i])
+        # Add reaction options concurrently; discord.py's rate limiter still serializes them per route in order
+        results = await asyncio.gather(*(discord_msg.add_reaction(emoji) for emoji in OPTION_EMOJIS[:len(options)]),
+                                       return_exceptions=True)
+        for error in results:
+            if isinstance(error, Exception):
+                log.warning("⚠️ Failed to add poll reaction: %s", error)
         
         # Send to GroupMe
-        payload = {
-            "bot_id": GROUPME_BOT_ID,
-            "text": groupme_poll_text
-        }
+        payload = groupme_bot_payload(groupme_poll_text)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(GROUPME_POST_URL, json=payload) as response:
-                if response.status == 202:
-                    await ctx.send("✅ Text-based poll created on both platforms!")
-                else:
-                    await ctx.send(f"⚠️ Discord poll created, GroupMe failed (status: {response.status})")
-                    
+        status = await post_to_groupme(payload)
+        if status == 202:
+            await ctx.send("✅ Text-based poll created on both platforms!")
+        else:
+            await ctx.send(f"⚠️ Discord poll created, GroupMe failed (status: {status})")
+                
     except Exception as e:
         await ctx.send(f"❌ Error creating text poll: {e}")
-        print(f"Text poll error: {e}")
+        log.exception("❌ Error creating text poll")
 
 @bot.command(name='nativepoll')
+@monitored_channel_only()
 async def create_native_poll(ctx, *, poll_text):
     """Create a native GroupMe poll directly: !nativepoll Question? Option1, Option2, Option3"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
-    
     if not GROUPME_ACCESS_TOKEN:
         await ctx.send("❌ GROUPME_ACCESS_TOKEN required for native polls")
         return
@@ -1211,107 +1636,90 @@ async def create_native_poll(ctx, *, poll_text):
         await ctx.send(f"Creating native GroupMe poll: **{question}?**")
         
         # Create the poll using GroupMe's native API
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{GROUPME_POLLS_CREATE_URL}?token={GROUPME_ACCESS_TOKEN}",
-                json=poll_payload,
-                headers={'Content-Type': 'application/json'}
-            ) as response:
-                response_text = await response.text()
+        status, response_text = await post_groupme_poll(poll_payload)
+        
+        if status == 201:  # Created
+            poll_data = orjson.loads(response_text)
+            groupme_poll = poll_data.get('poll', {}).get('data', {})
+            poll_id = groupme_poll.get('id')
+            
+            await ctx.send(f"✅ Native GroupMe poll created! Poll ID: `{poll_id}`")
+            
+            # Also create Discord poll for comparison
+            try:
+                discord_poll_options = []
+                for i, option in enumerate(options):
+                    emoji = f"{i+1}\u20e3"
+                    discord_poll_options.append(discord.PollMedia(text=option[:55], emoji=emoji))
+                
+                discord_poll = discord.Poll(
+                    question=f"{question}?",
+                    options=discord_poll_options,
+                    multiple=False,
+                    duration=24
+                )
+                
+                await ctx.send(poll=discord_poll)
+                await ctx.send("✅ Discord poll created too for comparison!")
+                
+            except Exception as e:
+                await ctx.send(f"⚠️ GroupMe poll created, Discord poll failed: {e}")
+                
+        else:
+            await ctx.send(f"❌ Failed to create GroupMe poll. Status: {status}")
+            await ctx.send(f"Response: {response_text[:200]}...")
                 
-                if response.status == 201:  # Created
-                    poll_data = await response.json()
-                    groupme_poll = poll_data.get('poll', {}).get('data', {})
-                    poll_id = groupme_poll.get('id')
-                    
-                    await ctx.send(f"✅ Native GroupMe poll created! Poll ID: `{poll_id}`")
-                    
-                    # Also create Discord poll for comparison
-                    try:
-                        discord_poll_options = []
-                        for i, option in enumerate(options):
-                            emoji = f"{i+1}\u20e3"
-                            discord_poll_options.append(discord.PollMedia(text=option[:55], emoji=emoji))
-                        
-                        discord_poll = discord.Poll(
-                            question=f"{question}?",
-                            options=discord_poll_options,
-                            multiple=False,
-                            duration=24
-                        )
-                        
-                        await ctx.send(poll=discord_poll)
-                        await ctx.send("✅ Discord poll created too for comparison!")
-                        
-                    except Exception as e:
-                        await ctx.send(f"⚠️ GroupMe poll created, Discord poll failed: {e}")
-                        
-                else:
-                    await ctx.send(f"❌ Failed to create GroupMe poll. Status: {response.status}")
-                    await ctx.send(f"Response: {response_text[:200]}...")
-                    
     except Exception as e:
         await ctx.send(f"❌ Error creating native poll: {e}")
-        print(f"Native poll error: {e}")
+        log.exception("❌ Error creating native poll")
 
 @bot.command(name='listpolls')
+@monitored_channel_only()
 async def list_groupme_polls(ctx):
     """List active GroupMe polls"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
-    
     if not GROUPME_ACCESS_TOKEN:
         await ctx.send("❌ GROUPME_ACCESS_TOKEN required to list polls")
         return
     
     try:
         # Get polls from GroupMe
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{GROUPME_POLLS_LIST_URL}?token={GROUPME_ACCESS_TOKEN}") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    polls = data.get('response', {}).get('polls', [])
-                    
-                    if not polls:
-                        await ctx.send("📭 No active GroupMe polls found.")
-                        return
-                    
-                    poll_list = []
-                    for poll in polls[:10]:  # Show max 10
-                        subject = poll.get('subject', 'No subject')[:50]
-                        poll_id = poll.get('id', 'Unknown')
-                        status = poll.get('status', 'unknown')
-                        owner_id = poll.get('owner_id', 'Unknown')
-                        
-                        poll_list.append(f"📊 **{subject}...** (ID: {poll_id}, Status: {status})")
-                    
-                    embed = discord.Embed(
-                        title="📊 Active GroupMe Polls",
-                        description="\n".join(poll_list),
-                        color=0x00ff00
-                    )
-                    await ctx.send(embed=embed)
-                    
-                else:
-                    await ctx.send(f"❌ Failed to fetch GroupMe polls. Status: {response.status}")
-                    
+        session = get_http_session()
+        async with groupme_slots, session.get(GROUPME_POLLS_LIST_URL, headers=GROUPME_AUTH_HEADERS) as response:
+            if response.status == 200:
+                data = await read_json(response)
+                polls = data.get('response', {}).get('polls', [])
+                
+                if not polls:
+                    await ctx.send("📭 No active GroupMe polls found.")
+                    return
+                
+                poll_list = [GROUPME_POLL_LINE.format(poll.get('subject', 'No subject')[:50], poll.get('id', 'Unknown'),
+                                                      poll.get('status', 'unknown'))
+                             for poll in polls[:10]]  # Show max 10
+                
+                embed = discord.Embed(
+                    title="📊 Active GroupMe Polls",
+                    description=embed_description(poll_list),
+                    color=0x00ff00
+                )
+                await ctx.send(embed=embed)
+                
+            else:
+                await ctx.send(f"❌ Failed to fetch GroupMe polls. Status: {response.status}")
+                
     except Exception as e:
         await ctx.send(f"❌ Error listing polls: {e}")
 
 @bot.command(name='pollinfo')
+@monitored_channel_only()
 async def get_poll_info(ctx, poll_id):
     """Get detailed info about a specific GroupMe poll"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
-    
     if not GROUPME_ACCESS_TOKEN:
         await ctx.send("❌ GROUPME_ACCESS_TOKEN required")
         return
     
     try:
-        poll_data = await get_groupme_poll(poll_id)
+        poll_data = await get_groupme_poll_cached(poll_id)
         if not poll_data:
             await ctx.send(f"❌ Could not find poll with ID: {poll_id}")
             return
@@ -1324,33 +1732,27 @@ async def get_poll_info(ctx, poll_id):
         visibility = poll_data.get('visibility', 'unknown')
         
         # Format timestamps
-        created_time = datetime.fromtimestamp(created_at).strftime('%Y-%m-%d %H:%M:%S') if created_at else 'Unknown'
-        expires_time = datetime.fromtimestamp(expiration).strftime('%Y-%m-%d %H:%M:%S') if expiration else 'Unknown'
+        created_time = format_timestamp(created_at)
+        expires_time = format_timestamp(expiration)
         
         # Get options and votes
-        options_text = ""
+        option_lines = []
         total_votes = 0
         for i, option in enumerate(poll_data.get('options', []), 1):
-            title = option.get('title', 'Unknown')
             votes = option.get('votes', 0)
             total_votes += votes
-            options_text += f"{i}. **{title}**: {votes} votes\n"
+            option_lines.append(f"{i}. **{option.get('title', 'Unknown')}**: {votes} votes")
         
         embed = discord.Embed(
             title=f"📊 Poll Info: {subject}",
             color=0x3498db
         )
-        embed.add_field(name="📋 Details", value=f"""
-**Status:** {status}
-**Type:** {poll_type}
-**Visibility:** {visibility}
-**Total Votes:** {total_votes}
-**Created:** {created_time}
-**Expires:** {expires_time}
-        """, inline=False)
-        
-        if options_text:
-            embed.add_field(name="📊 Options & Results", value=options_text, inline=False)
+        embed.add_field(name="📋 Details", value=POLL_DETAILS_TEMPLATE.format(
+            status=status, type=poll_type, visibility=visibility, total_votes=total_votes,
+            created=created_time, expires=expires_time), inline=False)
+        
+        if option_lines:
+            embed.add_field(name="📊 Options & Results", value='\n'.join(option_lines), inline=False)
         
         embed.add_field(name="🔍 Poll ID", value=f"`{poll_id}`", inline=False)
         
@@ -1359,11 +1761,10 @@ async def get_poll_info(ctx, poll_id):
     except Exception as e:
         await ctx.send(f"❌ Error getting poll info: {e}")
     """Check what poll features are available"""
-    if ctx.channel.id == DISCORD_CHANNEL_ID:
-        try:
-            import discord
-            
-            info = f"""🔍 **Poll Support Check**
+    try:
+        import discord
+        
+        info = f"""🔍 **Poll Support Check**
 **Discord.py version:** {discord.__version__}
 **Poll class available:** {'✅' if hasattr(discord, 'Poll') else '❌'}
 **PollMedia class available:** {'✅' if hasattr(discord, 'PollMedia') else '❌'}
@@ -1378,68 +1779,19 @@ async def get_poll_info(ctx, poll_id):
 • If Poll class missing: Update discord.py
 • If permissions missing: Check bot permissions
 • Use `!textpoll` as alternative"""
-            
-            await ctx.send(info)
-            
-            # Check bot permissions
-            permissions = ctx.channel.permissions_for(ctx.guild.me)
-            perm_info = f"""**Bot Permissions in this channel:**
-• Send Messages: {'✅' if permissions.send_messages else '❌'}
-• Add Reactions: {'✅' if permissions.add_reactions else '❌'}
-• Use External Emojis: {'✅' if permissions.use_external_emojis else '❌'}
-• Embed Links: {'✅' if permissions.embed_links else '❌'}
-• Manage Messages: {'✅' if permissions.manage_messages else '❌'}"""
-            
-            await ctx.send(perm_info)
-            
-        except Exception as e:
-            await ctx.send(f"❌ Error checking poll support: {e}")
-    else:
-        await ctx.send("❌ This command only works in the monitored channel.")
         
-        # Store message for threading context
-        recent_messages[message.channel.id].append({
-            'author': message.author.display_name,
-            'content': message.content,
-            'timestamp': time.time(),
-            'message_id': message.id
-        })
-        
-        # Keep only last 20 messages for context
-        if len(recent_messages[message.channel.id]) > 20:
-            recent_messages[message.channel.id].pop(0)
-        
-        # Handle replies
-        reply_context = None
-        if message.reference and message.reference.message_id:
-            try:
-                replied_message = await message.channel.fetch_message(message.reference.message_id)
-                reply_context = (replied_message.content[:100], replied_message.author.display_name)
-            except:
-                pass
-        
-        # Handle images
-        if message.attachments:
-            for attachment in message.attachments:
-                if attachment.content_type and attachment.content_type.startswith('image/'):
-                    print(f"🖼️ Found image attachment: {attachment.filename}")
-                    groupme_image_url = await upload_image_to_groupme(attachment.url)
-                    
-                    if groupme_image_url:
-                        await send_to_groupme(message.content, message.author.display_name, 
-                                            groupme_image_url, reply_context)
-                    else:
-                        await send_to_groupme(f"{message.content} [Image upload failed]", 
-                                            message.author.display_name, reply_context=reply_context)
-                else:
-                    await send_to_groupme(f"{message.content} [Attached: {attachment.filename}]", 
-                                        message.author.display_name, reply_context=reply_context)
-        else:
-            if message.content.strip():
-                await send_to_groupme(message.content, message.author.display_name, 
-                                    reply_context=reply_context)
-    
-    await bot.process_commands(message)
+        await ctx.send(info)
+        
+        # Check bot permissions
+        # One bitmask read, then a bitwise test per permission
+        permission_bits = ctx.channel.permissions_for(ctx.guild.me).value
+        perm_info = "**Bot Permissions in this channel:**\n" + "\n".join(
+            f"• {label}: {'✅' if permission_bits & flag else '❌'}" for label, flag in CHECKED_PERMISSIONS)
+        
+        await ctx.send(perm_info)
+        
+    except Exception as e:
+        await ctx.send(f"❌ Error checking poll support: {e}")
 
 @bot.event
 async def on_reaction_add(reaction, user):
@@ -1447,96 +1799,85 @@ async def on_reaction_add(reaction, user):
     if user.bot:
         return
     
-    if reaction.message.channel.id == DISCORD_CHANNEL_ID:
-        emoji = str(reaction.emoji)
+    message = reaction.message
+    if message.channel.id != DISCORD_CHANNEL_ID:
+        return
+    
+    # Poll option reactions (keycaps etc.) aren't in EMOJI_SET, so check for a tracked poll first
+    emoji = str(reaction.emoji)
+    if message.id in poll_mapping and await handle_poll_vote_to_groupme(message.id, emoji, user.display_name):
+        return
+    
+    # Only supported emojis are bridged; bail out before touching anything else
+    if emoji not in EMOJI_SET:
+        return
+    log.info("😀 Processing reaction %s from %s", emoji, user.display_name)
+    
+    # Check if this message was sent from GroupMe (stored in our mapping)
+    groupme_msg_id = message_mapping.get(message.id)
+    if groupme_msg_id is not None:
+        queued = await send_reaction_to_groupme(groupme_msg_id, emoji, user.display_name)
+        if queued:
+            log.info("✅ Reaction %s queued for GroupMe", emoji)
+    else:
+        # This is a reaction to a Discord-originated message
+        original_author = message.author.display_name
+        original_content = message.content[:50]
+        context = f"'{original_content}...' by {original_author}" if original_content else f"message by {original_author}"
         
-        # Check if this is a supported emoji
-        if emoji in EMOJI_MAPPING:
-            print(f"😀 Processing reaction {emoji} from {user.display_name}")
-            
-            # Check if this message was sent from GroupMe (stored in our mapping)
-            discord_msg_id = reaction.message.id
-            if discord_msg_id in message_mapping:
-                groupme_msg_id = message_mapping[discord_msg_id]
-                success = await send_reaction_to_groupme(groupme_msg_id, emoji, user.display_name)
-                if success:
-                    print(f"✅ Reaction {emoji} forwarded to GroupMe")
-            else:
-                # This is a reaction to a Discord-originated message
-                original_author = reaction.message.author.display_name
-                original_content = reaction.message.content[:50] if reaction.message.content else "a message"
-                context = f"'{original_content}...' by {original_author}" if original_content != "a message" else f"message by {original_author}"
-                
-                reaction_text = f"{user.display_name} reacted {emoji} to {context}"
-                
-                payload = {
-                    "bot_id": GROUPME_BOT_ID,
-                    "text": reaction_text
-                }
-                
-                async with aiohttp.ClientSession() as session:
-                    try:
-                        async with session.post(GROUPME_POST_URL, json=payload) as response:
-                            if response.status == 202:
-                                print(f"✅ Discord reaction sent to GroupMe: {reaction_text}")
-                    except Exception as e:
-                        print(f"❌ Error sending Discord reaction to GroupMe: {e}")
+        await queue_reaction_text(user.display_name, emoji, context)
 
 @bot.command(name='test')
+@monitored_channel_only()
 async def test_bridge(ctx):
     """Test command to verify the bridge is working"""
-    if ctx.channel.id == DISCORD_CHANNEL_ID:
-        await send_to_groupme("🧪 Enhanced bridge test message with poll support from Google Cloud Run!", "Bot Test")
-        await ctx.send("✅ Test message sent to GroupMe!")
-    else:
-        await ctx.send("❌ This command only works in the monitored channel.")
+    await send_to_groupme("🧪 Enhanced bridge test message with poll support from Google Cloud Run!", "Bot Test")
+    await ctx.send("✅ Test message sent to GroupMe!")
 
 @bot.command(name='testpoll')
+@monitored_channel_only()
 async def test_poll(ctx):
     """Create a test poll to verify poll functionality"""
-    if ctx.channel.id == DISCORD_CHANNEL_ID:
-        await ctx.send("Creating test poll...")
+    await ctx.send("Creating test poll...")
+    
+    # Create a simple test poll
+    try:
+        poll_options = [
+            discord.PollMedia(text="Red", emoji="🔴"),
+            discord.PollMedia(text="Blue", emoji="🔵"),
+            discord.PollMedia(text="Green", emoji="🟢")
+        ]
         
-        # Create a simple test poll
+        poll = discord.Poll(
+            question="What's your favorite color?",
+            options=poll_options,
+            multiple=False,
+            duration=1  # 1 hour
+        )
+        
+        poll_message = await ctx.send(poll=poll)
+        await ctx.send("✅ Test poll created! Check if it appears in GroupMe.")
+        
+        # Manually trigger the poll creation for testing
         try:
-            poll_options = [
-                discord.PollMedia(text="Red", emoji="🔴"),
-                discord.PollMedia(text="Blue", emoji="🔵"),
-                discord.PollMedia(text="Green", emoji="🟢")
-            ]
-            
-            poll = discord.Poll(
-                question="What's your favorite color?",
-                options=poll_options,
-                multiple=False,
-                duration=1  # 1 hour
-            )
-            
-            poll_message = await ctx.send(poll=poll)
-            await ctx.send("✅ Test poll created! Check if it appears in GroupMe.")
-            
-            # Manually trigger the poll creation for testing
-            try:
-                await create_groupme_poll_from_discord(poll, ctx.author.display_name, poll_message)
-                await ctx.send("🔄 Manually triggered GroupMe poll creation.")
-            except Exception as e:
-                await ctx.send(f"❌ Error creating GroupMe poll: {e}")
-                
+            await create_groupme_poll_from_discord(poll, ctx.author.display_name, poll_message)
+            await ctx.send("🔄 Manually triggered GroupMe poll creation.")
         except Exception as e:
-            await ctx.send(f"❌ Error creating Discord poll: {e}")
-            print(f"❌ Test poll error: {e}")
-    else:
-        await ctx.send("❌ This command only works in the monitored channel.")
+            await ctx.send(f"❌ Error creating GroupMe poll: {e}")
+            
+    except Exception as e:
+        await ctx.send(f"❌ Error creating Discord poll: {e}")
+        log.exception("❌ Test poll error")
 
 @bot.command(name='status')
+@monitored_channel_only()
 async def status(ctx):
     """Check bot status"""
-    if ctx.channel.id == DISCORD_CHANNEL_ID:
-        image_status = "✅" if GROUPME_ACCESS_TOKEN else "❌"
-        reactions_status = "✅" if (GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID) else "❌"
-        poll_status = "✅" if (GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID) else "❌"
-        
-        status_msg = f"""🟢 **Enhanced Bot Status**
+    image_status = "✅" if GROUPME_ACCESS_TOKEN else "❌"
+    reactions_status = "✅" if (GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID) else "❌"
+    poll_status = "✅" if (GROUPME_ACCESS_TOKEN and GROUPME_GROUP_ID) else "❌"
+    
+    status_msg = f"""🟢 **Enhanced Bot Status**
 🔗 Connected to GroupMe: {'✅' if GROUPME_BOT_ID else '❌'}
 🖼️ Image support: {image_status}
 😀 Reaction support: {reactions_status}
@@ -1545,92 +1886,73 @@ async def status(ctx):
 📊 Active polls: {len(active_polls)}
 📈 Recent messages tracked: {len(recent_messages.get(DISCORD_CHANNEL_ID, []))}
 
-**Supported Reactions:** {', '.join(EMOJI_MAPPING.keys())}
+**Supported Reactions:** {EMOJI_LIST_STR}
 **Poll Features:** ✅ Discord→GroupMe ✅ GroupMe→Discord ✅ Vote Sync"""
-        
-        await ctx.send(status_msg)
+    
+    await ctx.send(status_msg)
 
 @bot.command(name='polls')
+@monitored_channel_only()
 async def list_polls(ctx):
     """List active tracked polls"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
-    
     if not active_polls:
         await ctx.send("📭 No active tracked polls currently.")
         await ctx.send("💡 **Try these commands:**\n• `!nativepoll Question? Option1, Option2` - Create native GroupMe poll\n• `!listpolls` - List all GroupMe polls\n• `!textpoll Question? Option1, Option2` - Create text-based poll")
         return
     
     poll_list = []
-    for poll_id, poll_data in active_polls.items():
-        source = "📱 Discord" if poll_data['source'] == 'discord' else "📞 GroupMe"
-        age = int(time.time() - poll_data['created_at'])
+    for poll_id, poll in active_polls.items():
+        source = "📱 Discord" if poll.source == 'discord' else "📞 GroupMe"
+        age = int(time.monotonic() - poll.created_at)
         age_str = f"{age//3600}h {(age%3600)//60}m" if age >= 3600 else f"{age//60}m"
         
-        if poll_data['source'] == 'discord':
-            if hasattr(poll_data.get('discord_poll'), 'question'):
-                if hasattr(poll_data['discord_poll'].question, 'text'):
-                    question = poll_data['discord_poll'].question.text[:50]
-                else:
-                    question = str(poll_data['discord_poll'].question)[:50]
-            else:
-                question = "Unknown question"
-        else:
-            question = poll_data.get('groupme_poll', {}).get('question', 'Unknown')[:50]
+        question = poll.question[:50]
         
         # Add GroupMe poll ID if available
-        groupme_id = poll_data.get('groupme_poll_id', '')
+        groupme_id = poll.groupme_poll_id or ''
         groupme_id_str = f" (ID: {groupme_id})" if groupme_id else ""
         
-        poll_list.append(f"{source} **{question}...** (by {poll_data['author']}, {age_str} ago){groupme_id_str}")
+        poll_list.append(TRACKED_POLL_LINE.format(source, question, poll.author, age_str, groupme_id_str))
     
     embed = discord.Embed(
         title="📊 Active Tracked Polls", 
-        description="\n".join(poll_list), 
+        description=embed_description(poll_list), 
         color=0x00ff00
     )
     embed.add_field(
         name="💡 More Commands", 
-        value="`!listpolls` - All GroupMe polls\n`!nativepoll` - Create native poll\n`!pollinfo <id>` - Poll details", 
+        value=POLL_COMMANDS_HINT, 
         inline=False
     )
     await ctx.send(embed=embed)
 
 @bot.command(name='react')
+@monitored_channel_only()
 async def manual_react(ctx, emoji, *, message_context=None):
     """Manually send a reaction to GroupMe"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
-    
-    if emoji not in EMOJI_MAPPING:
-        await ctx.send(f"❌ Unsupported emoji. Supported: {', '.join(EMOJI_MAPPING.keys())}")
+    if emoji not in EMOJI_SET:
+        await ctx.send(f"❌ Unsupported emoji. Supported: {EMOJI_LIST_STR}")
         return
     
     context = message_context or "the last message"
-    reaction_text = f"{ctx.author.display_name} reacted {emoji} to {context}"
+    reaction_text = REACTION_TEMPLATE.format(ctx.author.display_name, emoji, context)
     
-    payload = {
-        "bot_id": GROUPME_BOT_ID,
-        "text": reaction_text
-    }
+    payload = groupme_bot_payload(reaction_text)
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(GROUPME_POST_URL, json=payload) as response:
-                if response.status == 202:
-                    await ctx.send(f"✅ Reaction sent: {reaction_text}")
-                else:
-                    await ctx.send("❌ Failed to send reaction to GroupMe")
-        except Exception as e:
-            await ctx.send(f"❌ Error: {e}")
+    try:
+        status = await post_to_groupme(payload)
+        if status == 202:
+            await ctx.send(f"✅ Reaction sent: {reaction_text}")
+        else:
+            await ctx.send("❌ Failed to send reaction to GroupMe")
+    except Exception as e:
+        await ctx.send(f"❌ Error: {e}")
 
 @bot.command(name='debug')
+@monitored_channel_only()
 async def debug_info(ctx):
     """Show detailed debug information"""
-    if ctx.channel.id == DISCORD_CHANNEL_ID:
-        debug_msg = f"""🔍 **Debug Information (Google Cloud Run)**
+    debug_msg = f"""🔍 **Debug Information (Google Cloud Run)**
 **Environment Variables:**
 • DISCORD_BOT_TOKEN: {'✅ Set' if DISCORD_BOT_TOKEN else '❌ Missing'}
 • GROUPME_BOT_ID: {'✅ Set' if GROUPME_BOT_ID else '❌ Missing'} 
@@ -1660,61 +1982,48 @@ async def debug_info(ctx):
 **Cloud Run Notes:**
 • Make sure webhook URL points to your Cloud Run service
 • Health checks available at: /, /health, /_ah/health"""
-        
-        await ctx.send(debug_msg)
-    else:
-        await ctx.send("❌ This command only works in the monitored channel.")
+    
+    await ctx.send(debug_msg)
 
 @bot.command(name='testgroupme')
+@monitored_channel_only()
 async def test_groupme_connection(ctx):
     """Test basic GroupMe connection"""
-    if ctx.channel.id == DISCORD_CHANNEL_ID:
-        await ctx.send("Testing GroupMe connection...")
-        
-        test_message = "🧪 Direct GroupMe connection test"
-        payload = {
-            "bot_id": GROUPME_BOT_ID,
-            "text": test_message
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(GROUPME_POST_URL, json=payload) as response:
-                    if response.status == 202:
-                        await ctx.send("✅ GroupMe connection successful!")
-                    else:
-                        await ctx.send(f"❌ GroupMe connection failed. Status: {response.status}")
-                        response_text = await response.text()
-                        print(f"GroupMe API response: {response_text}")
-            except Exception as e:
-                await ctx.send(f"❌ GroupMe connection error: {e}")
-    else:
-        await ctx.send("❌ This command only works in the monitored channel.")
-    """Show recent messages for threading context"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
+    await ctx.send("Testing GroupMe connection...")
+    
+    test_message = "🧪 Direct GroupMe connection test"
+    payload = groupme_bot_payload(test_message)
     
+    session = get_http_session()
+    try:
+        async with groupme_slots, session.post(GROUPME_POST_URL, json=payload) as response:
+            if response.status == 202:
+                await ctx.send("✅ GroupMe connection successful!")
+            else:
+                await ctx.send(f"❌ GroupMe connection failed. Status: {response.status}")
+                response_text = await response.text()
+                log.error("❌ GroupMe connection test failed. Status: %s, Response: %s", response.status, response_text)
+    except Exception as e:
+        log.exception("❌ GroupMe connection test error")
+        await ctx.send(f"❌ GroupMe connection error: {e}")
+    """Show recent messages for threading context"""
     recent = recent_messages.get(DISCORD_CHANNEL_ID, [])
     if not recent:
         await ctx.send("📭 No recent messages tracked.")
         return
     
     message_list = []
-    for i, msg in enumerate(recent[-10:], 1):  # Show last 10 messages
+    for i, msg in enumerate(islice(recent, max(0, len(recent) - 10), None), 1):  # Show last 10 messages
         content = msg['content'][:50] + "..." if len(msg['content']) > 50 else msg['content']
         message_list.append(f"**{i}.** {msg['author']}: {content}")
     
-    embed = discord.Embed(title="📋 Recent Messages", description="\n".join(message_list), color=0x00ff00)
+    embed = discord.Embed(title="📋 Recent Messages", description=embed_description(message_list), color=0x00ff00)
     await ctx.send(embed=embed)
 
 @bot.command(name='simplepoll')
+@monitored_channel_only()
 async def simple_poll_test(ctx, *, poll_text):
     """Test poll creation with simple text format: !simplepoll Question? Option1, Option2, Option3"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
-    
     try:
         # Parse the poll text
         if '?' not in poll_text:
@@ -1734,138 +2043,172 @@ async def simple_poll_test(ctx, *, poll_text):
             options = options[:10]  # Discord limit
             
         # Send poll to GroupMe first (simpler)
-        option_emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
-        
-        poll_text_groupme = f"📊 Poll from {ctx.author.display_name}: {question}?\n\n"
-        
-        for i, option in enumerate(options):
-            emoji = option_emojis[i] if i < len(option_emojis) else f"{i+1}."
-            poll_text_groupme += f"{emoji} {option}\n"
-        
-        poll_text_groupme += f"\nReact with the corresponding number to vote! 🗳️"
+        poll_text_groupme = (f"📊 Poll from {ctx.author.display_name}: {question}?\n\n"
+                             f"{numbered_options(options)}\n\nReact with the corresponding number to vote! 🗳️")
         
         # Send to GroupMe
-        payload = {
-            "bot_id": GROUPME_BOT_ID,
-            "text": poll_text_groupme
-        }
+        payload = groupme_bot_payload(poll_text_groupme)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(GROUPME_POST_URL, json=payload) as response:
-                if response.status == 202:
-                    await ctx.send(f"✅ Poll sent to GroupMe: {question}?")
-                    
-                    # Also create Discord poll
-                    try:
-                        poll_options = []
-                        for i, option in enumerate(options):
-                            emoji = option_emojis[i] if i < len(option_emojis) else None
-                            poll_options.append(discord.PollMedia(text=option[:55], emoji=emoji))
-                        
-                        poll = discord.Poll(
-                            question=f"{question}?",
-                            options=poll_options,
-                            multiple=False,
-                            duration=24
-                        )
-                        
-                        await ctx.send(poll=poll)
-                        await ctx.send("✅ Discord poll created too!")
-                        
-                    except Exception as e:
-                        await ctx.send(f"⚠️ GroupMe poll sent, but Discord poll failed: {e}")
-                        
-                else:
-                    await ctx.send(f"❌ Failed to send poll to GroupMe. Status: {response.status}")
-                    
+        status = await post_to_groupme(payload)
+        if status == 202:
+            await ctx.send(f"✅ Poll sent to GroupMe: {question}?")
+            
+            # Also create Discord poll
+            try:
+                poll_options = []
+                for i, option in enumerate(options):
+                    emoji = OPTION_EMOJIS[i] if i < len(OPTION_EMOJIS) else None
+                    poll_options.append(discord.PollMedia(text=option[:55], emoji=emoji))
+                
+                poll = discord.Poll(
+                    question=f"{question}?",
+                    options=poll_options,
+                    multiple=False,
+                    duration=24
+                )
+                
+                await ctx.send(poll=poll)
+                await ctx.send("✅ Discord poll created too!")
+                
+            except Exception as e:
+                await ctx.send(f"⚠️ GroupMe poll sent, but Discord poll failed: {e}")
+                
+        else:
+            await ctx.send(f"❌ Failed to send poll to GroupMe. Status: {status}")
+                
     except Exception as e:
         await ctx.send(f"❌ Error creating poll: {e}")
-        print(f"❌ Simple poll error: {e}")
+        log.exception("❌ Simple poll error")
 
 @bot.command(name='recent')
+@monitored_channel_only()
 async def show_recent(ctx):
     """Show recent messages for threading context"""
-    if ctx.channel.id != DISCORD_CHANNEL_ID:
-        await ctx.send("❌ This command only works in the monitored channel.")
-        return
-    
     recent = recent_messages.get(DISCORD_CHANNEL_ID, [])
     if not recent:
         await ctx.send("📭 No recent messages tracked.")
         return
     
     message_list = []
-    for i, msg in enumerate(recent[-10:], 1):  # Show last 10 messages
+    for i, msg in enumerate(islice(recent, max(0, len(recent) - 10), None), 1):  # Show last 10 messages
         content = msg['content'][:50] + "..." if len(msg['content']) > 50 else msg['content']
         message_list.append(f"**{i}.** {msg['author']}: {content}")
     
-    embed = discord.Embed(title="📋 Recent Messages", description="\n".join(message_list), color=0x00ff00)
+    embed = discord.Embed(title="📋 Recent Messages", description=embed_description(message_list), color=0x00ff00)
     await ctx.send(embed=embed)
 
+# Expire stale threading context periodically instead of on every message
+@tasks.loop(minutes=5)
+async def expire_recent_messages():
+    """Drop recent messages older than RECENT_MESSAGE_TTL from every channel buffer"""
+    cutoff = time.monotonic() - RECENT_MESSAGE_TTL
+    for channel_id, buffer in list(recent_messages.items()):
+        # Entries are appended in time order, so expired ones are always at the left
+        while buffer and buffer[0]['timestamp'] < cutoff:
+            buffer.popleft()
+        if not buffer:
+            del recent_messages[channel_id]
+
 # Cleanup old polls periodically
 async def cleanup_old_polls():
-    """Remove polls older than 24 hours"""
+    """Remove polls and vote tracking once they pass POLL_TTL"""
+    failures = 0
     while True:
         try:
-            current_time = time.time()
+            current_time = time.monotonic()
             expired_polls = []
             
-            for poll_id, poll_data in active_polls.items():
-                if current_time - poll_data['created_at'] > 86400:  # 24 hours
+            # Heap entries can be stale (poll already ended, vote re-recorded), so re-check the live entry
+            while poll_expiry_heap and poll_expiry_heap[0][0] <= current_time:
+                _, poll_id = heapq.heappop(poll_expiry_heap)
+                poll = active_polls.get(poll_id)
+                if poll and poll.expires_at <= current_time:
+                    forget_poll(poll_id)
                     expired_polls.append(poll_id)
             
-            for poll_id in expired_polls:
-                del active_polls[poll_id]
-                print(f"🗑️ Cleaned up expired poll: {poll_id}")
+            if expired_polls:
+                more = f" (+{len(expired_polls) - 10} more)" if len(expired_polls) > 10 else ""
+                log.info("🗑️ Cleaned up %s expired poll(s): %s%s", len(expired_polls), ', '.join(expired_polls[:10]), more)
             
             # Also cleanup old vote tracking
-            old_votes = []
-            for vote_key, vote_data in poll_vote_tracking.items():
-                if current_time - vote_data['timestamp'] > 86400:
-                    old_votes.append(vote_key)
-            
-            for vote_key in old_votes:
-                del poll_vote_tracking[vote_key]
-            
-            await asyncio.sleep(3600)  # Check every hour
-            
-        except Exception as e:
-            print(f"❌ Error in poll cleanup: {e}")
-            await asyncio.sleep(3600)
+            while vote_expiry_heap and vote_expiry_heap[0][0] <= current_time:
+                _, vote_key = heapq.heappop(vote_expiry_heap)
+                vote = poll_vote_tracking.get(vote_key)
+                if vote and vote[1] <= current_time:
+                    del poll_vote_tracking[vote_key]
+                    voters = poll_voters.get(vote_key[0])
+                    if voters is not None:
+                        voters.discard(vote_key[1])
+                        if not voters:
+                            del poll_voters[vote_key[0]]
+            failures = 0
+        except (KeyError, RuntimeError):
+            # Bookkeeping got out of step; retry next wake-up, but stop rather than rot if it persists
+            failures += 1
+            log.exception("❌ Error in poll cleanup (%s in a row)", failures)
+            if failures >= 5:
+                raise
+        
+        # Sleep until the next entry is due, waking at least hourly. Every entry shares
+        # POLL_TTL, so nothing inserted meanwhile can expire before that wake-up.
+        next_due = min((heap[0][0] for heap in (poll_expiry_heap, vote_expiry_heap) if heap), default=None)
+        delay = 3600 if next_due is None else next_due - time.monotonic()
+        await asyncio.sleep(max(1.0, min(3600.0, delay)))
+
+def request_shutdown():
+    """SIGTERM handler: close the Discord connection so run_bot's cleanup runs"""
+    global shutdown_task
+    if shutdown_task is None:
+        log.info("🛑 SIGTERM received, shutting down...")
+        shutdown_task = asyncio.create_task(bot.close())
+
+async def run_bot():
+    """Run the Discord bot and release the shared HTTP session on shutdown"""
+    # Cloud Run sends SIGTERM before stopping the container; the default handler would skip cleanup
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, request_shutdown)
+    except NotImplementedError:
+        pass  # Signal handlers aren't supported on Windows event loops
+    try:
+        # Bind the port before logging in so Cloud Run's startup probe and GroupMe webhooks
+        # don't see connection refused while the Discord gateway login is slow
+        await start_health_server()
+        async with bot:
+            await bot.start(DISCORD_BOT_TOKEN)
+    finally:
+        await stop_notice_flusher()
+        for task in list(background_tasks):
+            task.cancel()
+        await stop_outbound_workers()
+        await stop_health_server()
+        await close_http_session()
 
 if __name__ == "__main__":
-    # Validate environment variables
-    if not DISCORD_BOT_TOKEN:
-        print("❌ DISCORD_BOT_TOKEN environment variable not set!")
-        exit(1)
-    
-    if not GROUPME_BOT_ID:
-        print("❌ GROUPME_BOT_ID environment variable not set!")
-        exit(1)
-    
-    if DISCORD_CHANNEL_ID == 0:
-        print("❌ DISCORD_CHANNEL_ID environment variable not set!")
-        exit(1)
-    
-    if not GROUPME_ACCESS_TOKEN:
-        print("⚠️ GROUPME_ACCESS_TOKEN not set - image uploads, reactions, and polls will be disabled")
-    
-    if not GROUPME_GROUP_ID:
-        print("⚠️ GROUPME_GROUP_ID not set - advanced features including polls will be limited")
-    
-    # Start health check server
-    print("🏥 Starting enhanced health check server with webhook support...")
-    health_thread = threading.Thread(target=run_health_server, daemon=True)
-    health_thread.start()
-    
-    time.sleep(2)
-    
-    # Start poll cleanup task
-    asyncio.create_task(cleanup_old_polls())
-    
-    # Start Discord bot
-    print("🚀 Starting Enhanced Discord to GroupMe bridge with poll support...")
+    log_listener = setup_logging()
     try:
-        bot.run(DISCORD_BOT_TOKEN)
-    except Exception as e:
-        print(f"❌ Failed to start bot: {e}")
+        # Validate environment variables
+        missing = CONFIG.missing_required()
+        if missing:
+            for name in missing:
+                log.error("❌ %s environment variable not set!", name)
+            exit(1)
+        
+        if not GROUPME_ACCESS_TOKEN:
+            log.warning("⚠️ GROUPME_ACCESS_TOKEN not set - image uploads, reactions, and polls will be disabled")
+        
+        if not GROUPME_GROUP_ID:
+            log.warning("⚠️ GROUPME_GROUP_ID not set - advanced features including polls will be limited")
+        
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            log.info("⚡ Using uvloop event loop")
+        
+        # Start Discord bot
+        log.info("🚀 Starting Enhanced Discord to GroupMe bridge with poll support...")
+        try:
+            asyncio.run(run_bot())
+        except Exception:
+            log.exception("❌ Failed to start bot")
+    finally:
+        # Flush whatever is still queued before the process exits
+        log_listener.stop()
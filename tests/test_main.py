@@ -0,0 +1,303 @@
+"""Bridge tests - run from the repo root with: python -m unittest discover -s tests -t ."""
+import asyncio
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import orjson
+from discord.ext import commands
+
+import main
+
+
+class ParseGroupMePollTextTest(unittest.TestCase):
+    """parse_groupme_poll_text"""
+
+    def test_comma_separated_options(self):
+        self.assertEqual(main.parse_groupme_poll_text("Poll: Lunch? pizza, tacos"),
+                         main.PollParse("Lunch?", ("pizza", "tacos")))
+
+    def test_inline_keycap_options(self):
+        self.assertEqual(main.parse_groupme_poll_text("Poll: Lunch? 1️⃣ pizza 2️⃣ tacos"),
+                         main.PollParse("Lunch?", ("pizza", "tacos")))
+
+    def test_inline_letter_options(self):
+        self.assertEqual(main.parse_groupme_poll_text("Poll: When? A) now B) later"),
+                         main.PollParse("When?", ("now", "later")))
+
+    def test_newline_options_keep_inline_markers(self):
+        self.assertEqual(main.parse_groupme_poll_text("Poll: Q?\nPlan A) now\nPlan B) later"),
+                         main.PollParse("Q?", ("Plan A) now", "Plan B) later")))
+
+    def test_letter_markers_inside_words_are_not_split(self):
+        self.assertEqual(main.parse_groupme_poll_text("Poll: Q? Plan A) now, Plan B) later"),
+                         main.PollParse("Q?", ("Plan A) now", "Plan B) later")))
+
+    def test_blank_options_are_dropped(self):
+        self.assertEqual(main.parse_groupme_poll_text("Poll: Q?\n1. x\n-  \n2. y"),
+                         main.PollParse("Q?", ("x", "y")))
+        self.assertEqual(main.parse_groupme_poll_text("Poll: Q? a, , b"),
+                         main.PollParse("Q?", ("a", "b")))
+
+    def test_numbered_newline_options(self):
+        self.assertEqual(main.parse_groupme_poll_text("Poll: Q?\n1. x\n2. y"),
+                         main.PollParse("Q?", ("x", "y")))
+
+    def test_ordinary_chat_is_not_a_poll(self):
+        self.assertIsNone(main.parse_groupme_poll_text("see you at lunch"))
+
+
+class PollReactionVoteTest(unittest.IsolatedAsyncioTestCase):
+    """on_reaction_add on a tracked Discord poll"""
+
+    def setUp(self):
+        self.message = SimpleNamespace(id=111, channel=SimpleNamespace(id=main.DISCORD_CHANNEL_ID),
+                                       author=SimpleNamespace(display_name="alice"), content="Lunch?")
+        poll = main.TrackedPoll('discord', self.message, None, 'gm-1', "alice", "Lunch?", ["Pizza", "Tacos"],
+                                option_by_emoji={"1️⃣": "Pizza", "2️⃣": "Tacos"})
+        main.track_poll('discord_111', poll)
+        main.poll_mapping[self.message.id] = 'discord_111'
+
+    def tearDown(self):
+        main.forget_poll('discord_111')
+        while not main.notice_queue.empty():
+            main.notice_queue.get_nowait()
+            main.notice_queue.task_done()
+
+    async def react(self, emoji, user_name):
+        reaction = SimpleNamespace(message=self.message, emoji=emoji)
+        await main.on_reaction_add(reaction, SimpleNamespace(bot=False, display_name=user_name))
+
+    async def test_option_reaction_is_forwarded_as_a_vote(self):
+        await self.react("2️⃣", "bob")
+        self.assertEqual(main.notice_queue.get_nowait(), ('groupme', "🗳️ bob voted for: Tacos"))
+        self.assertEqual(main.poll_vote_tracking[('discord_111', "bob")][0], "Tacos")
+        self.assertEqual(main.poll_voters['discord_111'], {"bob"})
+
+    async def test_repeat_vote_is_not_forwarded_again(self):
+        await self.react("1️⃣", "bob")
+        await self.react("2️⃣", "bob")
+        self.assertEqual(main.notice_queue.qsize(), 1)
+
+    async def test_forgetting_the_poll_drops_its_votes(self):
+        await self.react("1️⃣", "bob")
+        main.forget_poll('discord_111')
+        self.assertNotIn(('discord_111', "bob"), main.poll_vote_tracking)
+        self.assertNotIn('discord_111', main.poll_voters)
+
+
+class NoticeFlusherShutdownTest(unittest.IsolatedAsyncioTestCase):
+    """stop_notice_flusher"""
+
+    async def test_queued_notices_are_flushed_before_stopping(self):
+        with mock.patch.object(main, 'post_to_groupme', mock.AsyncMock(return_value=202)) as post, \
+                mock.patch.object(main, 'NOTICE_FRAME_SECONDS', 0):
+            main.notice_task = asyncio.create_task(main.notice_flusher())
+            await main.queue_notice('groupme', "🗳️ bob voted for: Tacos")
+            await main.stop_notice_flusher()
+        post.assert_awaited_once_with(main.groupme_bot_payload("🗳️ bob voted for: Tacos"))
+        self.assertIsNone(main.notice_task)
+        self.assertTrue(main.notice_queue.empty())
+
+
+class PollExpiryTest(unittest.IsolatedAsyncioTestCase):
+    """cleanup_old_polls expiry heaps"""
+
+    class SweepDone(Exception):
+        """Raised from the patched sleep to stop the loop after one sweep"""
+
+    def tracked(self, poll_id, expires_at):
+        poll = main.TrackedPoll('groupme', None, None, poll_id, "alice", "Q?", ["a", "b"])
+        poll.expires_at = expires_at
+        main.track_poll(poll_id, poll)
+        main.groupme_poll_mapping[poll_id] = poll_id
+        return poll
+
+    async def sweep(self):
+        with mock.patch('asyncio.sleep', side_effect=self.SweepDone):
+            with self.assertRaises(self.SweepDone):
+                await main.cleanup_old_polls()
+
+    def tearDown(self):
+        for poll_id in list(main.active_polls):
+            main.forget_poll(poll_id)
+        main.poll_expiry_heap.clear()
+        main.vote_expiry_heap.clear()
+
+    async def test_due_polls_and_votes_are_forgotten(self):
+        now = time.monotonic()
+        self.tracked('old', now - 1)
+        vote_key = ('old', "bob")
+        main.poll_vote_tracking[vote_key] = ("a", now - 1)
+        main.poll_voters['old'].add("bob")
+        main.heapq.heappush(main.vote_expiry_heap, (now - 1, vote_key))
+        await self.sweep()
+        self.assertNotIn('old', main.active_polls)
+        self.assertNotIn('old', main.groupme_poll_mapping)
+        self.assertNotIn(vote_key, main.poll_vote_tracking)
+        self.assertNotIn('old', main.poll_voters)
+        self.assertEqual(main.poll_expiry_heap, [])
+
+    async def test_stale_heap_entry_keeps_a_live_poll(self):
+        poll = self.tracked('fresh', time.monotonic() - 1)
+        poll.expires_at = time.monotonic() + main.POLL_TTL  # Re-tracked since the heap entry was pushed
+        await self.sweep()
+        self.assertIs(main.active_polls['fresh'], poll)
+
+
+class GroupMeMessageLookupTest(unittest.IsolatedAsyncioTestCase):
+    """get_groupme_message paging and shared fetches"""
+
+    def setUp(self):
+        for name, value in (('GROUPME_ACCESS_TOKEN', "token"), ('GROUPME_GROUP_ID', "g1"), ('recent_page_fetch', None)):
+            patcher = mock.patch.object(main, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        main.groupme_message_cache.clear()
+        self.addCleanup(main.groupme_message_cache.clear)
+        self.pages = []
+
+    async def fake_page(self, limit, before_id=None):
+        """Stand-in for fetch_groupme_page: 'new' is on the latest page, 'old' on the one behind it"""
+        self.pages.append((limit, before_id))
+        await asyncio.sleep(0)
+        if before_id is None:
+            main.groupme_message_cache['new'] = {'id': 'new', 'text': "hi"}
+            return 'new'
+        main.groupme_message_cache['old'] = {'id': 'old', 'text': "earlier"}
+        return 'old'
+
+    async def test_recent_message_needs_one_small_page(self):
+        with mock.patch.object(main, 'fetch_groupme_page', self.fake_page):
+            self.assertEqual((await main.get_groupme_message('new'))['text'], "hi")
+            self.assertEqual((await main.get_groupme_message('new'))['text'], "hi")
+        self.assertEqual(self.pages, [(20, None)])
+
+    async def test_concurrent_misses_share_page_fetches(self):
+        with mock.patch.object(main, 'fetch_groupme_page', self.fake_page):
+            results = await asyncio.gather(*(main.get_groupme_message('old') for _ in range(3)))
+        self.assertEqual([result['text'] for result in results], ["earlier"] * 3)
+        self.assertEqual(self.pages, [(20, None), (100, 'new')])
+        self.assertEqual(main.older_page_fetches, {})
+
+
+class WebhookQueueTest(unittest.IsolatedAsyncioTestCase):
+    """groupme_webhook and webhook_worker"""
+
+    async def asyncSetUp(self):
+        self.queue = asyncio.Queue(maxsize=1)
+        for patcher in (mock.patch.object(main, 'webhook_queue', self.queue),
+                        mock.patch.object(main, 'GROUPME_GROUP_ID', "g1"),
+                        mock.patch.dict(main.webhook_stats, {"processed": 0, "dropped": 0})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def post(self, data):
+        return await main.groupme_webhook(SimpleNamespace(read=mock.AsyncMock(return_value=orjson.dumps(data))))
+
+    async def test_event_is_acked_and_queued(self):
+        response = await self.post({'id': "1", 'group_id': "g1", 'text': "hi"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.queue.get_nowait()[1]['id'], "1")
+
+    async def test_full_queue_answers_503(self):
+        await self.post({'id': "1", 'group_id': "g1"})
+        response = await self.post({'id': "2", 'group_id': "g1"})
+        self.assertEqual(response.status, 503)
+        self.assertEqual(main.webhook_stats["dropped"], 1)
+
+    async def test_worker_processes_queued_events(self):
+        data = {'id': "1", 'group_id': "g1", 'text': "hi"}
+        with mock.patch.object(main, 'handle_groupme_webhook_event', mock.AsyncMock()) as handle:
+            await self.post(data)
+            worker = asyncio.create_task(main.webhook_worker())
+            await self.queue.join()
+            worker.cancel()
+        handle.assert_awaited_once_with(data)
+        self.assertEqual(main.webhook_stats["processed"], 1)
+
+
+class GroupMePollCacheTest(unittest.IsolatedAsyncioTestCase):
+    """get_groupme_poll_cached"""
+
+    def setUp(self):
+        main.groupme_poll_cache.clear()
+        self.addCleanup(main.groupme_poll_cache.clear)
+
+    async def test_concurrent_and_repeat_lookups_share_one_fetch(self):
+        with mock.patch.object(main, 'get_groupme_poll', mock.AsyncMock(return_value={'id': "p1"})) as fetch:
+            results = await asyncio.gather(*(main.get_groupme_poll_cached("p1") for _ in range(3)))
+            await main.get_groupme_poll_cached("p1")
+        self.assertEqual(results, [{'id': "p1"}] * 3)
+        fetch.assert_awaited_once_with("p1")
+        self.assertEqual(main.poll_fetches, {})
+
+    async def test_failed_lookup_is_not_cached(self):
+        with mock.patch.object(main, 'get_groupme_poll', mock.AsyncMock(return_value=None)) as fetch:
+            self.assertIsNone(await main.get_groupme_poll_cached("p1"))
+            self.assertIsNone(await main.get_groupme_poll_cached("p1"))
+        self.assertEqual(fetch.await_count, 2)
+
+
+class RunBotStartupTest(unittest.IsolatedAsyncioTestCase):
+    """run_bot startup order"""
+
+    async def test_health_server_is_bound_before_discord_login(self):
+        bound_at_login = []
+
+        async def start(token):
+            bound_at_login.append(bool(main.health_runner and main.health_runner.addresses))
+
+        with mock.patch.object(main, 'PORT', 0), mock.patch.object(main.bot, 'start', start):
+            await main.run_bot()
+        self.assertEqual(bound_at_login, [True])
+
+
+class CommandErrorTest(unittest.IsolatedAsyncioTestCase):
+    """on_command_error replies"""
+
+    def context(self):
+        return SimpleNamespace(send=mock.AsyncMock(), command=main.bot.get_command('react'),
+                               message=SimpleNamespace(content="!react"))
+
+    async def test_bad_arguments_get_usage(self):
+        ctx = self.context()
+        await main.on_command_error(ctx, commands.BadArgument("Bad emoji"))
+        ctx.send.assert_awaited_once_with("❌ Bad emoji\nUsage: `!react <emoji> [message_context]`")
+
+    async def test_unknown_commands_are_ignored(self):
+        ctx = self.context()
+        await main.on_command_error(ctx, commands.CommandNotFound())
+        ctx.send.assert_not_awaited()
+
+    async def test_other_failures_are_reported(self):
+        ctx = self.context()
+        with self.assertLogs(main.log, 'ERROR'):
+            await main.on_command_error(ctx, commands.CommandInvokeError(RuntimeError("boom")))
+        self.assertIn("❌ Command failed", ctx.send.await_args.args[0])
+
+
+class GroupMeTextPollTriggerTest(unittest.IsolatedAsyncioTestCase):
+    """handle_groupme_webhook_event text poll detection"""
+
+    async def handle(self, text, sender_type='user'):
+        with mock.patch.object(main, 'forward_groupme_to_discord', mock.AsyncMock()), \
+                mock.patch.object(main, 'handle_groupme_text_poll', mock.AsyncMock()) as text_poll:
+            await main.handle_groupme_webhook_event({'text': text, 'name': "alice", 'sender_type': sender_type})
+        return text_poll.await_count
+
+    async def test_poll_prefix_and_chart_emoji_trigger(self):
+        self.assertEqual(await self.handle("POLL: Lunch? pizza, tacos"), 1)
+        self.assertEqual(await self.handle("📊 Lunch?\npizza\ntacos"), 1)
+
+    async def test_vote_and_survey_prefixes_do_not_trigger(self):
+        self.assertEqual(await self.handle("vote: Lunch? pizza, tacos"), 0)
+        self.assertEqual(await self.handle("survey: Lunch? pizza, tacos"), 0)
+
+    async def test_bot_posts_do_not_trigger(self):
+        self.assertEqual(await self.handle("📊 Poll from alice: Lunch?", sender_type='bot'), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()